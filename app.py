@@ -4,28 +4,61 @@ Web Interface for Spotify Podcast Downloader + Transcription
 Flask-based modern web application
 """
 
+import io
 import os
 import re
 import json
 import time
+import mimetypes
 import uuid
+import random
 import shutil
+import string
 import tempfile
+import functools
 import threading
+import weakref
 import subprocess
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from urllib.parse import urlparse, quote
 
-from flask import Flask, render_template, request, jsonify, send_file, session
+from flask import Flask, Response, render_template, request, jsonify, send_file, session, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import feedparser
+import orjson
+from pydantic import BaseModel
+from dateutil import parser as date_parser, tz as date_tz
+from lxml import etree
 
 # Load environment variables
 load_dotenv()
 
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify/request.get_json through orjson - status and post payloads carry long Hebrew text"""
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype=self.mimetype
+        )
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', os.urandom(24))  # For session management
 
 
@@ -45,6 +78,7 @@ def get_api_key():
 SCRIPT_DIR = Path(__file__).parent
 DOWNLOADS_DIR = SCRIPT_DIR / "downloads"
 TRANSCRIPTS_DIR = SCRIPT_DIR / "transcripts"
+IMAGES_DIR = SCRIPT_DIR / "static" / "generated_images"
 WHATSAPP_SCRIPTS_DIR = Path.home() / ".claude" / "skills" / "whatsapp" / "scripts"
 
 DOWNLOADS_DIR.mkdir(exist_ok=True)
@@ -56,13 +90,305 @@ WHATSAPP_GROUPS = [
     {"id": "120363306760997369@g.us", "name": "עדכונים וטיפים על בינה מלאכותית #2"},
 ]
 
-# Job storage (in production, use Redis or database)
-jobs = {}
-
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
 }
 
+# Shared session - reuses TCP/TLS connections to Spotify, iTunes and feed hosts
+SESSION = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+SESSION.mount("https://", _http_adapter)
+SESSION.mount("http://", _http_adapter)
+
+# Precompiled regular expressions
+_NEXT_DATA_START = b'<script id="__NEXT_DATA__" type="application/json">'
+_SCRIPT_END = b'</script>'
+# Show ID patterns, most specific first - the page can link other shows
+# (e.g. /show/ recommendations) before the episode's own spotify:show: URI
+_SHOW_ID_RES = (
+    re.compile(rb'"showUri":"spotify:show:([a-zA-Z0-9]{22})"'),
+    re.compile(rb'spotify:show:([a-zA-Z0-9]{22})'),
+    re.compile(rb'/show/([a-zA-Z0-9]{22})'),
+)
+_YOUTUBE_ID_PATTERNS = [
+    re.compile(r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})'),
+    re.compile(r'youtube\.com\/shorts\/([a-zA-Z0-9_-]{11})'),
+]
+_FEED_TYPE_RE = re.compile(rb'<(rss|feed)\b')
+_FILENAME_BAD_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+# =============================================================================
+# Job Storage
+# =============================================================================
+
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "podcast_")
+JOB_TTL = 86400  # Keep jobs for 24 hours
+
+
+def connect_redis():
+    """
+    Connect to Redis when REDIS_URL or REDIS_HOST is set, otherwise (or if the
+    server is unreachable) return None so jobs stay in this process's memory
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url and not os.getenv("REDIS_HOST"):
+        return None
+
+    try:
+        import redis
+
+        if redis_url:
+            client = redis.Redis.from_url(redis_url, decode_responses=True, socket_connect_timeout=2)
+        else:
+            client = redis.Redis(
+                host=os.getenv("REDIS_HOST"),
+                port=int(os.getenv("REDIS_PORT", 6379)),
+                decode_responses=True,
+                socket_connect_timeout=2,
+            )
+        client.ping()
+        return client
+    except Exception as e:
+        print(f"Redis not available ({e}) - using in-memory storage")
+        return None
+
+
+class JobStore:
+    """
+    Job state shared between Flask routes and background workers.
+
+    Backed by Redis hashes (job:{id}) so every gunicorn worker sees the same
+    jobs. Falls back to an in-process dict when Redis is not configured.
+    Nested dicts (posts, edited_posts) live in their own hash so concurrent
+    writers for different topics don't overwrite each other.
+    """
+
+    NESTED_FIELDS = ("posts", "edited_posts")
+
+    def __init__(self, redis_client=None, ttl: int = JOB_TTL):
+        self.redis = redis_client
+        self.ttl = ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._version = 0
+
+    def _key(self, job_id: str) -> str:
+        return f"{CACHE_KEY_PREFIX}job:{job_id}"
+
+    def _channel(self, job_id: str) -> str:
+        return f"{self._key(job_id)}:events"
+
+    def _notify(self):
+        """Wake local watchers - caller must hold self._lock"""
+        self._version += 1
+        self._changed.notify_all()
+
+    def create(self, job_id: str, data: dict):
+        """Create a new job"""
+        if self.redis is None:
+            with self._lock:
+                self._jobs[job_id] = dict(data)
+            return
+
+        key = self._key(job_id)
+        pipe = self.redis.pipeline()
+        pipe.delete(key, *(f"{key}:{field}" for field in self.NESTED_FIELDS))
+        pipe.hset(key, mapping={k: orjson.dumps(v).decode() for k, v in data.items()})
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def get(self, job_id: str) -> dict:
+        """Get a snapshot of the job, or None if it doesn't exist"""
+        if self.redis is None:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return None
+                snapshot = dict(job)
+                for field in self.NESTED_FIELDS:
+                    if field in snapshot:
+                        snapshot[field] = dict(snapshot[field])
+                return snapshot
+
+        key = self._key(job_id)
+        pipe = self.redis.pipeline()
+        pipe.hgetall(key)
+        for field in self.NESTED_FIELDS:
+            pipe.hgetall(f"{key}:{field}")
+        raw, *nested = pipe.execute()
+
+        if not raw:
+            return None
+
+        job = {k: orjson.loads(v) for k, v in raw.items()}
+        for field, values in zip(self.NESTED_FIELDS, nested):
+            if values:
+                job[field] = {k: orjson.loads(v) for k, v in values.items()}
+        return job
+
+    def update(self, job_id: str, **fields):
+        """Update one or more top-level job fields"""
+        if self.redis is None:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    job.update(fields)
+                    self._notify()
+            return
+
+        key = self._key(job_id)
+        pipe = self.redis.pipeline()
+        pipe.hset(key, mapping={k: orjson.dumps(v).decode() for k, v in fields.items()})
+        pipe.expire(key, self.ttl)
+        pipe.publish(self._channel(job_id), "update")
+        pipe.execute()
+
+    def set_item(self, job_id: str, field: str, item_key: str, value):
+        """Set a single entry inside a nested field (e.g. posts[topic_index])"""
+        if self.redis is None:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    job.setdefault(field, {})[item_key] = value
+                    self._notify()
+            return
+
+        nested_key = f"{self._key(job_id)}:{field}"
+        pipe = self.redis.pipeline()
+        pipe.hset(nested_key, item_key, orjson.dumps(value).decode())
+        pipe.expire(nested_key, self.ttl)
+        pipe.publish(self._channel(job_id), "update")
+        pipe.execute()
+
+    def watch(self, job_id: str, timeout: float = 15.0):
+        """
+        Yield once immediately, then again whenever the job changes
+        (or after `timeout` seconds without changes, for keepalives).
+
+        Uses Redis pub/sub so updates from any worker process are seen;
+        the in-memory backend waits on a condition variable instead.
+        """
+        if self.redis is None:
+            with self._lock:
+                version = self._version
+            while True:
+                yield
+                with self._changed:
+                    self._changed.wait_for(lambda: self._version != version, timeout)
+                    version = self._version
+
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self._channel(job_id))
+        try:
+            while True:
+                yield
+                if pubsub.get_message(timeout=timeout):
+                    # Coalesce bursts (e.g. download progress) into one snapshot
+                    while pubsub.get_message(timeout=0):
+                        pass
+        finally:
+            pubsub.close()
+
+
+redis_client = connect_redis()
+job_store = JobStore(redis_client)
+
+# Serialize check-then-generate steps so concurrent requests for the same
+# job (or the same post) don't pay for the same Gemini call twice.
+# Weak values: a lock disappears once no request holds or waits on it,
+# so finished and expired jobs don't accumulate entries.
+_job_locks = weakref.WeakValueDictionary()
+_job_locks_guard = threading.Lock()
+
+
+def job_lock(job_id: str, *item) -> threading.RLock:
+    """Get the lock for a job, or for one item of it (e.g. job_lock(job_id, "posts", 2))"""
+    key = (job_id, *item)
+    with _job_locks_guard:
+        lock = _job_locks.get(key)
+        if lock is None:
+            lock = _job_locks[key] = threading.RLock()
+        return lock
+
+
+# =============================================================================
+# Lookup Cache
+# =============================================================================
+
+# Fallback cache when Redis is not available: key -> (expires_at, value)
+_local_cache = {}
+_local_cache_lock = threading.Lock()
+LOCAL_CACHE_MAX_ENTRIES = 1024
+
+NEGATIVE_CACHE_TTL = 600  # Cache failed lookups for 10 minutes
+
+
+def cache_get(key: str) -> str:
+    """Get a cached string value, or None on miss"""
+    if redis_client is not None:
+        try:
+            return redis_client.get(key)
+        except Exception as e:
+            print(f"Cache read error: {e}")
+            return None
+
+    with _local_cache_lock:
+        entry = _local_cache.get(key)
+        if entry and entry[0] > time.time():
+            return entry[1]
+        _local_cache.pop(key, None)
+    return None
+
+
+def cache_set(key: str, value: str, ttl: int):
+    """Store a string value with TTL (seconds)"""
+    if redis_client is not None:
+        try:
+            redis_client.setex(key, ttl, value)
+        except Exception as e:
+            print(f"Cache write error: {e}")
+        return
+
+    now = time.time()
+    with _local_cache_lock:
+        if len(_local_cache) >= LOCAL_CACHE_MAX_ENTRIES:
+            # Drop expired entries first, then the oldest writes, so a
+            # long-running worker doesn't keep every key it ever cached
+            for stale_key in [k for k, (expires_at, _) in _local_cache.items() if expires_at <= now]:
+                del _local_cache[stale_key]
+            while len(_local_cache) >= LOCAL_CACHE_MAX_ENTRIES:
+                del _local_cache[next(iter(_local_cache))]
+        _local_cache.pop(key, None)  # Re-insert at the end (newest)
+        _local_cache[key] = (now + ttl, value)
+
+
+def cached(prefix: str, ttl: int):
+    """
+    Cache the JSON result of a single-argument lookup.
+    Empty results (None / dict of Nones) are cached for NEGATIVE_CACHE_TTL only.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(arg):
+            key = f"{CACHE_KEY_PREFIX}{prefix}:{arg}"
+            raw = cache_get(key)
+            if raw is not None:
+                return orjson.loads(raw)
+
+            result = func(arg)
+            is_empty = not result or (isinstance(result, dict) and not any(result.values()))
+            cache_set(key, orjson.dumps(result).decode(), NEGATIVE_CACHE_TTL if is_empty else ttl)
+            return result
+        return wrapper
+    return decorator
+
 
 # =============================================================================
 # Helper Functions (from main.py)
@@ -95,33 +421,21 @@ def extract_spotify_ids(url: str) -> dict:
     return result
 
 
-def get_show_id_from_episode(episode_id: str) -> str:
-    """Get Show ID from Episode ID via embed page"""
-    url = f"https://open.spotify.com/embed/episode/{episode_id}"
-
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        response.raise_for_status()
-        html_text = response.text
-
-        patterns = [
-            r'"showUri":"spotify:show:([a-zA-Z0-9]{22})"',
-            r'spotify:show:([a-zA-Z0-9]{22})',
-            r'/show/([a-zA-Z0-9]{22})',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, html_text)
-            if match:
-                return match.group(1)
-    except:
-        pass
-
-    return None
+def _extract_next_data(html: bytes) -> bytes:
+    """Slice the __NEXT_DATA__ JSON out of the page with two literal searches"""
+    start = html.find(_NEXT_DATA_START)
+    if start == -1:
+        return None
+    start += len(_NEXT_DATA_START)
+    end = html.find(_SCRIPT_END, start)
+    return html[start:end] if end != -1 else None
 
 
-def get_podcast_info_from_spotify(episode_id: str) -> dict:
-    """Get podcast info from Spotify embed page"""
+def _fetch_embed(episode_id: str) -> dict:
+    """
+    Fetch the Spotify embed page once and parse everything we need from it.
+    Fields that couldn't be found (or a failed fetch) are left as None.
+    """
     info = {
         "episode_title": None,
         "show_title": None,
@@ -129,15 +443,22 @@ def get_podcast_info_from_spotify(episode_id: str) -> dict:
         "duration": None
     }
 
+    # The oEmbed endpoint (open.spotify.com/oembed) is much smaller but only
+    # carries the episode title and thumbnail - no show id or show name, and the
+    # Web API needs OAuth. The embed page is the only unauthenticated source for
+    # both, so it stays; _fetch_embed is called once per episode and cached.
     try:
         embed_url = f"https://open.spotify.com/embed/episode/{episode_id}"
-        response = requests.get(embed_url, headers=HEADERS, timeout=15)
+        response = SESSION.get(embed_url, headers=HEADERS, timeout=15)
         response.raise_for_status()
-        html = response.text
+        html = response.content  # Scan bytes - no decode of the whole page
+    except:
+        return info
 
-        match = re.search(r'<script id="__NEXT_DATA__" type="application/json">(.+?)</script>', html)
-        if match:
-            data = json.loads(match.group(1))
+    try:
+        next_data = _extract_next_data(html)
+        if next_data:
+            data = orjson.loads(next_data)
             entity = data.get('props', {}).get('pageProps', {}).get('state', {}).get('data', {}).get('entity', {})
 
             if entity:
@@ -148,24 +469,38 @@ def get_podcast_info_from_spotify(episode_id: str) -> dict:
                 related_uri = entity.get('relatedEntityUri', '')
                 if 'spotify:show:' in related_uri:
                     info["show_id"] = related_uri.split(':')[-1]
-
-        if not info["show_id"]:
-            match = re.search(r'spotify:show:([a-zA-Z0-9]{22})', html)
-            if match:
-                info["show_id"] = match.group(1)
     except:
         pass
 
+    if not info["show_id"]:
+        for pattern in _SHOW_ID_RES:
+            match = pattern.search(html)
+            if match:
+                info["show_id"] = match.group(1).decode('ascii')
+                break
+
     return info
 
 
+def get_show_id_from_episode(episode_id: str) -> str:
+    """Get Show ID from Episode ID via embed page"""
+    return get_podcast_info_from_spotify(episode_id).get("show_id")
+
+
+@cached("spotify_info", ttl=86400)
+def get_podcast_info_from_spotify(episode_id: str) -> dict:
+    """Get podcast info from Spotify embed page"""
+    return _fetch_embed(episode_id)
+
+
+@cached("itunes_rss", ttl=7 * 86400)
 def get_rss_from_itunes(podcast_name: str) -> str:
     """Search iTunes for real RSS feed"""
     try:
         encoded_name = quote(podcast_name)
         itunes_url = f"https://itunes.apple.com/search?term={encoded_name}&media=podcast&entity=podcast&limit=5"
 
-        response = requests.get(itunes_url, timeout=15)
+        response = SESSION.get(itunes_url, timeout=15)
         data = response.json()
 
         results = data.get('results', [])
@@ -187,156 +522,551 @@ def get_rss_from_itunes(podcast_name: str) -> str:
     return None
 
 
+# Timezone abbreviations found in podcast feeds (IST = Israel, not India)
+TZINFOS = {
+    abbr: date_tz.gettz(zone)
+    for abbr, zone in {
+        "EST": "US/Eastern", "EDT": "US/Eastern",
+        "CST": "US/Central", "CDT": "US/Central",
+        "MST": "US/Mountain", "MDT": "US/Mountain",
+        "PST": "US/Pacific", "PDT": "US/Pacific",
+        "GMT": "UTC", "UT": "UTC", "UTC": "UTC", "Z": "UTC",
+        "BST": "Europe/London", "CET": "Europe/Paris", "CEST": "Europe/Paris",
+        "IST": "Asia/Jerusalem", "IDT": "Asia/Jerusalem",
+    }.items()
+}
+
+
+_unknown_tz_warned = set()
+
+
+def _tzinfo_for(name, offset):
+    """
+    Resolve a timezone name for dateutil. Unknown abbreviations are read as
+    UTC (what feedparser would do anyway) and reported once per abbreviation.
+    """
+    if name is None and offset is None:
+        return None  # No timezone in the string
+    if name in TZINFOS:
+        return TZINFOS[name]
+    if offset is not None:
+        return date_tz.tzoffset(name, offset)
+    if name not in _unknown_tz_warned:
+        _unknown_tz_warned.add(name)
+        print(f"Warning: unknown timezone abbreviation {name!r} in feed date, treating it as UTC")
+    return timezone.utc
+
+
+def parse_feed_date(date_string: str):
+    """
+    feedparser date handler backed by dateutil - much faster than feedparser's
+    built-in RFC822 chain. Dates without a timezone, or with an abbreviation
+    missing from TZINFOS, are taken as UTC; the latter logs a warning so the
+    table can be extended. Unparseable strings raise, and feedparser then
+    tries its own handlers.
+    """
+    parsed = date_parser.parse(date_string, tzinfos=_tzinfo_for)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).timetuple()
+
+
+feedparser.registerDateHandler(parse_feed_date)
+
+
+ITUNES_NS = "{http://www.itunes.com/dtds/podcast-1.0.dtd}"
+
+
+def _sniff_feed_type(prefix: bytes) -> str:
+    """Detect feed format from the first bytes: 'rss', 'atom' or 'unknown'"""
+    match = _FEED_TYPE_RE.search(prefix)
+    if not match:
+        return 'unknown'
+    return 'rss' if match.group(1) == b'rss' else 'atom'
+
+
+def _open_feed_stream(response) -> tuple:
+    """Wrap a streamed response so the start can be peeked for sniffing"""
+    response.raw.decode_content = True  # Let urllib3 handle gzip
+    # urllib3 closes raw at EOF by default, and BufferedReader's next read
+    # would then raise "read of closed file" instead of returning b''
+    response.raw.auto_close = False
+    stream = io.BufferedReader(response.raw, buffer_size=64 * 1024)
+    return stream, _sniff_feed_type(stream.peek(2048)[:2048])
+
+
+def _fast_rss_parse(stream, feed_info: dict):
+    """
+    Minimal RSS 2.0 parser (lxml iterparse) - yields only the fields
+    find_episode_in_rss / extract_episode_data read, in feedparser's shape.
+    The channel title is stored in feed_info['title'].
+    """
+    for _, item in etree.iterparse(stream, events=('end',), tag='item', huge_tree=True, recover=True):
+        if 'title' not in feed_info:
+            channel = item.getparent()
+            feed_info['title'] = (channel.findtext('title') or '').strip() if channel is not None else ''
+
+        entry = {
+            "id": (item.findtext('guid') or '').strip(),
+            "link": (item.findtext('link') or '').strip(),
+            "itunes_duration": (item.findtext(f'{ITUNES_NS}duration') or '').strip(),
+            "enclosures": [
+                {"href": enc.get('url', ''), "type": enc.get('type', '')}
+                for enc in item.iterfind('enclosure')
+            ],
+        }
+        title = item.findtext('title')
+        if title is not None:
+            entry["title"] = title.strip()
+
+        # Drop processed items so memory stays flat
+        item.clear()
+        while item.getprevious() is not None:
+            del item.getparent()[0]
+
+        yield entry
+
+
+RSS_CACHE_TTL = 3600  # Keep parsed feeds + validators for an hour
+
+
+def _slim_entry(entry) -> dict:
+    """Keep only the entry fields the episode lookup reads (JSON-serializable)"""
+    return {
+        "id": str(entry.get('id', '') or entry.get('guid', '')),
+        "link": entry.get('link', ''),
+        "title": entry.get('title', 'unknown'),
+        "itunes_duration": entry.get('itunes_duration', ''),
+        "enclosures": [
+            {"href": enc.get('href', '') or enc.get('url', ''), "type": enc.get('type', '')}
+            for enc in entry.get('enclosures', [])
+        ],
+        "links": [
+            {"href": link.get('href', ''), "type": link.get('type', '')}
+            for link in entry.get('links', [])
+        ],
+    }
+
+
+def _rss_cache_load(rss_url: str) -> dict:
+    """Load cached feed entries + ETag/Last-Modified for a feed URL"""
+    raw = cache_get(f"{CACHE_KEY_PREFIX}rss:{rss_url}")
+    return orjson.loads(raw) if raw else None
+
+
+def _rss_cache_store(rss_url: str, response, feed_title: str, entries: list, complete: bool):
+    """
+    Cache parsed entries with the response validators. complete=False means
+    only the first entries were parsed (streaming stopped at a match).
+    """
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if not etag and not last_modified:
+        return  # Nothing to revalidate with
+
+    cache_set(f"{CACHE_KEY_PREFIX}rss:{rss_url}", orjson.dumps({
+        "etag": etag,
+        "last_modified": last_modified,
+        "feed_title": feed_title,
+        "entries": entries,
+        "complete": complete,
+    }).decode(), RSS_CACHE_TTL)
+
+
+def _conditional_headers(cached: dict) -> dict:
+    """Build request headers with If-None-Match / If-Modified-Since"""
+    headers = dict(HEADERS)
+    if cached:
+        if cached.get("etag"):
+            headers['If-None-Match'] = cached["etag"]
+        if cached.get("last_modified"):
+            headers['If-Modified-Since'] = cached["last_modified"]
+    return headers
+
+
+def _feed_from_cache(cached: dict):
+    """Rebuild a feedparser-like object from a cache record"""
+    return feedparser.FeedParserDict(
+        feed=feedparser.FeedParserDict(title=cached.get("feed_title") or ''),
+        entries=cached["entries"]
+    )
+
+
 def fetch_rss_feed(rss_url: str):
-    """Fetch and parse RSS feed"""
+    """
+    Fetch and parse RSS feed - RSS 2.0 via lxml fast path, anything else via feedparser.
+    Revalidates a cached copy with a conditional GET; 304 skips download and parse.
+    """
+    cached = _rss_cache_load(rss_url)
+    if cached and not cached.get("complete"):
+        cached = None  # A partial entry list can't stand in for the whole feed
+
     try:
-        response = requests.get(rss_url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        return feedparser.parse(response.content)
-    except:
-        return None
+        with SESSION.get(rss_url, headers=_conditional_headers(cached), timeout=30, stream=True) as response:
+            if response.status_code == 304 and cached:
+                return _feed_from_cache(cached)
 
+            response.raise_for_status()
+            stream, feed_type = _open_feed_stream(response)
 
-def find_episode_in_rss(feed, episode_id: str, episode_title: str = None) -> dict:
-    """Find specific episode in RSS feed"""
-    if not feed or not feed.entries:
+            if feed_type == 'rss':
+                feed_info = {}
+                entries = list(_fast_rss_parse(stream, feed_info))
+                feed = feedparser.FeedParserDict(feed=feedparser.FeedParserDict(feed_info), entries=entries)
+            else:
+                feed = feedparser.parse(
+                    stream,
+                    response_headers={'content-type': response.headers.get('content-type', '')}
+                )
+
+            _rss_cache_store(rss_url, response, feed.feed.get('title'), [_slim_entry(e) for e in feed.entries], True)
+            return feed
+    except:
         return None
 
-    def extract_episode_data(entry):
-        data = {
-            "title": entry.get('title', 'unknown'),
-            "mp3_url": None,
-            "duration": entry.get('itunes_duration', ''),
-            "safe_title": sanitize_filename(entry.get('title', 'unknown'))
-        }
 
-        for enc in entry.get('enclosures', []):
-            enc_type = enc.get('type', '')
-            enc_url = enc.get('href', '') or enc.get('url', '')
-            if 'audio' in enc_type or enc_url.endswith('.mp3') or 'mp3' in enc_url:
-                data["mp3_url"] = enc_url
+def extract_episode_data(entry) -> dict:
+    """Extract title, duration and MP3 URL from an RSS entry"""
+    data = {
+        "title": entry.get('title', 'unknown'),
+        "mp3_url": None,
+        "duration": entry.get('itunes_duration', ''),
+        "safe_title": sanitize_filename(entry.get('title', 'unknown'))
+    }
+
+    for enc in entry.get('enclosures', []):
+        enc_type = enc.get('type', '')
+        enc_url = enc.get('href', '') or enc.get('url', '')
+        if 'audio' in enc_type or enc_url.endswith('.mp3') or 'mp3' in enc_url:
+            data["mp3_url"] = enc_url
+            break
+
+    if not data["mp3_url"]:
+        for link in entry.get('links', []):
+            link_type = link.get('type', '')
+            link_url = link.get('href', '')
+            if 'audio' in link_type or link_url.endswith('.mp3'):
+                data["mp3_url"] = link_url
                 break
 
-        if not data["mp3_url"]:
-            for link in entry.get('links', []):
-                link_type = link.get('type', '')
-                link_url = link.get('href', '')
-                if 'audio' in link_type or link_url.endswith('.mp3'):
-                    data["mp3_url"] = link_url
-                    break
+    return data
 
-        return data
 
-    # Search by episode ID
-    for entry in feed.entries:
-        guid = entry.get('id', '') or entry.get('guid', '')
-        if episode_id in str(guid):
-            return extract_episode_data(entry)
+def _search_entries(entries, episode_id: str, episode_title: str = None) -> tuple:
+    """
+    Scan entries until one matches the episode ID or exact title.
+    Stops consuming the iterable at the first such match.
 
-        link = entry.get('link', '')
-        if episode_id in str(link):
-            return extract_episode_data(entry)
+    Returns:
+        tuple: (match, candidate) - candidate is the first partial title match
+    """
+    episode_title_lower = episode_title.lower().strip() if episode_title else None
+    candidate = None
+
+    for entry in entries:
+        entry_title = entry.get('title', '').lower().strip()
 
-    # Search by title
+        if episode_id in entry.get('id', '') or episode_id in entry.get('link', '') or (
+                episode_title_lower and episode_title_lower == entry_title):
+            return entry, candidate
+
+        if candidate is None and episode_title_lower and entry_title and (
+                episode_title_lower in entry_title or entry_title in episode_title_lower):
+            candidate = entry
+
+    return None, candidate
+
+
+def find_episode_streaming(rss_url: str, episode_id: str, episode_title: str = None) -> tuple:
+    """
+    Stream an RSS 2.0 feed and stop as soon as the episode is found.
+    Entries seen so far are cached with the feed's ETag/Last-Modified, so a
+    later job for the same show can revalidate and skip the download.
+    Non-RSS feeds (Atom etc.) return (None, None) so the caller can use
+    the full feedparser path.
+
+    Returns:
+        tuple: (episode, feed_title) - episode is None if not found
+    """
+    cached = _rss_cache_load(rss_url)
+
+    try:
+        with SESSION.get(rss_url, headers=_conditional_headers(cached), timeout=30, stream=True) as response:
+            if response.status_code == 304 and cached:
+                match, candidate = _search_entries(cached["entries"], episode_id, episode_title)
+                if match or cached.get("complete"):
+                    episode = match or candidate
+                    return (extract_episode_data(episode) if episode else None), cached.get("feed_title")
+                # Episode is past the cached prefix - let the caller do a full fetch
+                return None, cached.get("feed_title")
+
+            response.raise_for_status()
+            stream, feed_type = _open_feed_stream(response)
+            if feed_type != 'rss':
+                return None, None
+
+            feed_info = {}
+            seen = []
+
+            def tracked_entries():
+                for entry in _fast_rss_parse(stream, feed_info):
+                    seen.append(entry)
+                    yield entry
+
+            match, candidate = _search_entries(tracked_entries(), episode_id, episode_title)
+            feed_title = feed_info.get('title') or None
+            _rss_cache_store(rss_url, response, feed_title, seen, complete=match is None)
+
+            episode = match or candidate
+            return (extract_episode_data(episode) if episode else None), feed_title
+    except Exception as e:
+        print(f"Streaming RSS parse failed: {e}")
+
+    return None, None
+
+
+def _index_entries(entries) -> tuple:
+    """
+    One pass over the feed: guid/link/title lookup dicts (first entry wins)
+    plus the normalized (guid, link, title, entry) rows for substring fallbacks.
+    """
+    by_id = {}
+    by_title = {}
+    rows = []
+    for entry in entries:
+        guid = str(entry.get('id', '') or entry.get('guid', ''))
+        link = str(entry.get('link', ''))
+        title = entry.get('title', '').lower().strip()
+        by_id.setdefault(guid, entry)
+        by_id.setdefault(link, entry)
+        by_title.setdefault(title, entry)
+        rows.append((guid, link, title, entry))
+    return by_id, by_title, rows
+
+
+def find_episode_in_rss(feed, episode_id: str, episode_title: str = None) -> dict:
+    """Find specific episode in RSS feed"""
+    if not feed or not feed.entries:
+        return None
+
+    by_id, by_title, rows = _index_entries(feed.entries)
+
+    # Search by episode ID - exact guid/link first, then contained in either
+    entry = by_id.get(episode_id)
+    if entry is None:
+        entry = next((e for guid, link, _, e in rows if episode_id in guid or episode_id in link), None)
+    if entry is not None:
+        return extract_episode_data(entry)
+
+    # Search by title - exact first, then partial
     if episode_title:
         episode_title_lower = episode_title.lower().strip()
-        for entry in feed.entries:
-            entry_title = entry.get('title', '').lower().strip()
-            if episode_title_lower == entry_title or episode_title_lower in entry_title or entry_title in episode_title_lower:
-                return extract_episode_data(entry)
+        entry = by_title.get(episode_title_lower)
+        if entry is None:
+            entry = next((e for _, _, title, e in rows
+                          if episode_title_lower in title or title in episode_title_lower), None)
+        if entry is not None:
+            return extract_episode_data(entry)
 
     return None
 
 
+@functools.lru_cache(maxsize=256)
 def sanitize_filename(name: str) -> str:
     """Clean filename from problematic characters"""
-    name = re.sub(r'[<>:"/\\|?*]', '', name)
-    name = re.sub(r'\s+', ' ', name).strip()
+    name = _FILENAME_BAD_CHARS_RE.sub('', name)
+    name = _WHITESPACE_RE.sub(' ', name).strip()
     if len(name) > 100:
         name = name[:100]
     return name
 
 
-def download_mp3(url: str, output_path: Path, progress_callback=None) -> bool:
-    """Download MP3 file with progress"""
-    try:
-        response = requests.get(url, headers=HEADERS, stream=True, timeout=60)
-        response.raise_for_status()
+# Limit concurrent downloads per upstream host so jobs don't starve each other
+MAX_DOWNLOADS_PER_HOST = 3
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
 
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
-        chunk_size = 8192
 
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
+def _semaphore_for(host: str) -> threading.Semaphore:
+    """Get (or create) the download semaphore for a host"""
+    with _host_semaphores_lock:
+        return _host_semaphores.setdefault(host, threading.Semaphore(MAX_DOWNLOADS_PER_HOST))
 
-                    if progress_callback and total_size:
-                        percent = (downloaded / total_size) * 100
-                        progress_callback(percent)
 
-        return True
-    except Exception as e:
-        print(f"Download error: {e}")
-        return False
+PARALLEL_DOWNLOAD_MIN_SIZE = 50 * 1024 * 1024  # Split bigger files into ranged parts
+PARALLEL_DOWNLOAD_PARTS = 4
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MB
 
 
-def transcribe_with_gemini(audio_path: Path, progress_callback=None, api_key: str = None) -> str:
-    """Transcribe audio with Gemini API"""
-    if not api_key:
-        api_key = os.getenv("GEMINI_API_KEY")
+def _probe_download(url: str) -> tuple:
+    """
+    HEAD the URL to learn the final location, size and range support.
 
-    if not api_key:
-        print("ERROR: No API key provided for transcription")
-        raise ValueError("נדרש מפתח API לתמלול. הזן מפתח בהגדרות.")
+    Returns:
+        tuple: (final_url, size, supports_range) - size is 0 if unknown
+    """
+    try:
+        head = SESSION.head(url, headers=HEADERS, allow_redirects=True, timeout=10)
+        head.raise_for_status()
+        size = int(head.headers.get('content-length', 0))
+        supports_range = head.headers.get('accept-ranges', '').lower() == 'bytes'
+        return head.url, size, supports_range
+    except (requests.RequestException, ValueError):
+        # Some hosts reject HEAD - fall back to a plain GET
+        return url, 0, False
 
-    # Validate audio file exists
-    audio_path = Path(audio_path)
-    if not audio_path.exists():
-        raise FileNotFoundError(f"קובץ האודיו לא נמצא: {audio_path}")
 
-    temp_dir = None
+class _RangeNotSupported(IOError):
+    """The host advertised Accept-Ranges but answered a ranged GET without 206"""
+
+
+def _download_range(url: str, fd: int, start: int, end: int, on_bytes) -> None:
+    """Download bytes [start, end] into fd at their offsets, resuming on failure"""
+    pos = start
+    for attempt in range(DOWNLOAD_RETRIES + 1):
+        try:
+            headers = {**HEADERS, 'Range': f'bytes={pos}-{end}'}
+            with SESSION.get(url, headers=headers, stream=True, timeout=60) as response:
+                if response.status_code != 206:
+                    response.raise_for_status()
+                    raise _RangeNotSupported(f"Expected 206 for range request, got {response.status_code}")
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    os.pwrite(fd, chunk, pos)
+                    pos += len(chunk)
+                    on_bytes(len(chunk))
+            if pos > end:
+                return
+        except requests.RequestException:
+            if attempt == DOWNLOAD_RETRIES:
+                raise
+        time.sleep(2 ** attempt)
+    raise IOError(f"Incomplete range {start}-{end}: stopped at {pos}")
+
+
+def _download_plain(url: str, output_path: Path, progress_callback=None) -> None:
+    """Single GET without resume, for hosts that don't support ranges"""
+    response = SESSION.get(url, headers=HEADERS, stream=True, timeout=60)
+    response.raise_for_status()
+
+    total_size = int(response.headers.get('content-length', 0))
+
+    with open(output_path, 'wb', buffering=DOWNLOAD_CHUNK_SIZE) as f:
+        if not (progress_callback and total_size):
+            response.raw.decode_content = True
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+        else:
+            downloaded = 0
+            last_percent = -1
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                downloaded += len(chunk)
+
+                # Only report whole-percent changes
+                percent = int(downloaded * 100 / total_size)
+                if percent != last_percent:
+                    last_percent = percent
+                    progress_callback(percent)
+
+
+def download_mp3(url: str, output_path: Path, progress_callback=None) -> bool:
+    """
+    Download MP3 file with progress.
+
+    When the host supports byte ranges, failed transfers resume where they
+    stopped, and files over PARALLEL_DOWNLOAD_MIN_SIZE are fetched as
+    PARALLEL_DOWNLOAD_PARTS concurrent ranges written straight into place.
+    """
     try:
-        from google import genai
+        with _semaphore_for(urlparse(url).netloc):
+            final_url, total_size, supports_range = _probe_download(url)
 
-        client = genai.Client(api_key=api_key)
+            if not (supports_range and total_size and hasattr(os, 'pwrite')):
+                _download_plain(final_url, output_path, progress_callback)
+                return True
 
-        # Copy to temp with ASCII name (important for file upload)
-        temp_dir = tempfile.mkdtemp()
-        temp_path = Path(temp_dir) / "podcast_audio.mp3"
-        shutil.copy2(audio_path, temp_path)
+            lock = threading.Lock()
+            state = {"downloaded": 0, "percent": -1}
+
+            def on_bytes(n):
+                if not progress_callback:
+                    return
+                with lock:
+                    state["downloaded"] += n
+                    percent = int(state["downloaded"] * 100 / total_size)
+                    if percent == state["percent"]:
+                        return
+                    state["percent"] = percent
+                progress_callback(percent)
+
+            parts = PARALLEL_DOWNLOAD_PARTS if total_size > PARALLEL_DOWNLOAD_MIN_SIZE else 1
+            part_size = -(-total_size // parts)
+            ranges = [(i, min(i + part_size, total_size) - 1) for i in range(0, total_size, part_size)]
+
+            fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.ftruncate(fd, total_size)
+                if len(ranges) == 1:
+                    _download_range(final_url, fd, 0, total_size - 1, on_bytes)
+                else:
+                    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                        futures = [pool.submit(_download_range, final_url, fd, start, end, on_bytes)
+                                   for start, end in ranges]
+                        for future in futures:
+                            future.result()
+            except _RangeNotSupported as e:
+                # HEAD promised ranges but GET ignores them - do a single plain download
+                print(f"{e}; retrying without ranges")
+                os.close(fd)
+                fd = None
+                _download_plain(final_url, output_path, progress_callback)
+            finally:
+                if fd is not None:
+                    os.close(fd)
 
-        if progress_callback:
-            progress_callback("uploading")
+        return True
+    except Exception as e:
+        print(f"Download error: {e}")
+        # Don't leave a pre-sized or partial file that looks like a finished download
+        output_path.unlink(missing_ok=True)
+        return False
 
-        print(f"Uploading audio file: {temp_path} ({temp_path.stat().st_size / 1024 / 1024:.1f} MB)")
-        audio_file = client.files.upload(file=str(temp_path))
-        print(f"Upload complete, file state: {audio_file.state.name}")
 
-        # Wait for processing with timeout
-        max_wait = 300  # 5 minutes max
-        waited = 0
-        while audio_file.state.name == "PROCESSING" and waited < max_wait:
-            time.sleep(1)
-            waited += 1
-            audio_file = client.files.get(name=audio_file.name)
-            if waited % 10 == 0:
-                print(f"Still processing... ({waited}s)")
+# Cap concurrent Gemini calls across all jobs/requests in this process, so
+# parallel posts and transcription segments don't burst past the quota
+GEMINI_GATE = threading.BoundedSemaphore(int(os.getenv("GEMINI_CONCURRENCY", 16)))
+GEMINI_RETRIES = 4
 
-        if audio_file.state.name == "FAILED":
-            raise Exception("העיבוד של קובץ האודיו נכשל בשרת של Google")
 
-        if waited >= max_wait:
-            raise Exception("תם הזמן לעיבוד קובץ האודיו")
+@functools.lru_cache(maxsize=8)
+def get_genai_client(api_key: str):
+    """
+    One google-genai Client per API key, shared by every job in this process
+    so its HTTP connection pool (and TLS sessions) is reused across calls
+    """
+    from google import genai
+    return genai.Client(api_key=api_key)
 
-        if progress_callback:
-            progress_callback("transcribing")
 
-        print("Starting transcription with Gemini 3 Pro...")
+def _is_rate_limited(error: Exception) -> bool:
+    """429 / RESOURCE_EXHAUSTED from either Gemini SDK"""
+    return getattr(error, "code", None) == 429 or "RESOURCE_EXHAUSTED" in str(error)
+
 
-        prompt = """תמלל את קובץ האודיו הזה בעברית במדויק.
+def call_gemini(func, *args, **kwargs):
+    """Run a Gemini API call through the concurrency gate, backing off on rate limits"""
+    for attempt in range(GEMINI_RETRIES + 1):
+        with GEMINI_GATE:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt == GEMINI_RETRIES or not _is_rate_limited(e):
+                    raise
+        # Back off outside the gate so other calls can proceed
+        time.sleep(2 ** attempt + random.random())
+
+
+_TRANSCRIBE_PROMPT = """תמלל את קובץ האודיו הזה בעברית במדויק.
 
 **חשוב מאוד:**
 - תמלול מילה במילה - אל תדלג, אל תקצר, אל תסכם
@@ -350,56 +1080,355 @@ def transcribe_with_gemini(audio_path: Path, progress_callback=None, api_key: st
 
 **התחל לתמלל:**"""
 
-        response = client.models.generate_content(
+TRANSCRIBE_SEGMENT_SECONDS = 600  # Transcribe long episodes in 10-minute segments
+TRANSCRIBE_WORKERS = 4
+_TIMESTAMP_RE = re.compile(r'\[(?:(\d+):)?(\d{1,2}):(\d{2})\]')
+
+
+def _probe_duration(audio_path: Path) -> float:
+    """Audio duration in seconds via ffprobe, or None if it can't be read"""
+    if not shutil.which("ffprobe"):
+        return None
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", str(audio_path)],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        return float(result.stdout.strip())
+    except (subprocess.TimeoutExpired, ValueError):
+        return None
+
+
+def _split_mp3(audio_path: Path, out_dir: Path, segment_seconds: int = TRANSCRIBE_SEGMENT_SECONDS) -> list:
+    """
+    Split audio into fixed-length segments with ffmpeg (stream copy, no re-encode).
+    Returns an empty list if ffmpeg is missing or fails, or if ffprobe shows the
+    audio fits in one segment - the caller then uploads the original file
+    instead of a full copy.
+    """
+    if not shutil.which("ffmpeg"):
+        return []
+
+    duration = _probe_duration(audio_path)
+    if duration is not None and duration <= segment_seconds:
+        return []
+
+    pattern = out_dir / "segment_%03d.mp3"
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-i", str(audio_path),
+             "-f", "segment", "-segment_time", str(segment_seconds), "-c", "copy", str(pattern)],
+            capture_output=True,
+            text=True,
+            timeout=300
+        )
+    except subprocess.TimeoutExpired:
+        return []
+
+    segments = sorted(out_dir.glob("segment_*.mp3"))
+    if result.returncode != 0 or not segments:
+        print(f"ffmpeg split failed: {result.stderr[:200]}")
+        return []
+    return segments
+
+
+def _offset_timestamps(text: str, offset_seconds: int) -> str:
+    """Shift [MM:SS] / [H:MM:SS] timestamps of a segment by its start offset"""
+    if not offset_seconds:
+        return text
+
+    def shift(match):
+        hours = int(match.group(1) or 0)
+        total = hours * 3600 + int(match.group(2)) * 60 + int(match.group(3)) + offset_seconds
+        return f"[{total // 60:02d}:{total % 60:02d}]"
+
+    return _TIMESTAMP_RE.sub(shift, text)
+
+
+def _file_state(audio_file) -> str:
+    """State name of an uploaded file; None when the SDK didn't fill it in"""
+    state = getattr(audio_file, "state", None)
+    return getattr(state, "name", None)
+
+
+def _wait_for_file(client, audio_file, max_wait: float = 300, max_delay: float = 15.0, max_errors: int = 6):
+    """
+    Poll an uploaded file until Gemini finishes processing it (or max_wait passes).
+    The state returned by the upload is checked first, so a file that is
+    already ACTIVE costs no sleep and no extra files.get. After that the poll
+    interval starts at 0.5s and doubles up to max_delay, with jitter;
+    transient errors are tolerated up to max_errors in a row.
+    """
+    deadline = time.monotonic() + max_wait
+    delay = 0.5
+    errors = 0
+    polls = 0
+    while time.monotonic() < deadline:
+        state = _file_state(audio_file)
+        # No state straight after upload: ask once, right away, instead of sleeping
+        if state != "PROCESSING" and (state is not None or polls):
+            break
+        if state == "PROCESSING":
+            time.sleep(delay + random.uniform(0, delay * 0.5))
+            delay = min(delay * 2, max_delay)
+        polls += 1
+        try:
+            audio_file = client.files.get(name=audio_file.name)
+            errors = 0
+        except Exception:
+            errors += 1
+            if errors >= max_errors:
+                raise
+    return audio_file
+
+
+def _transcribe_segment(client, segment_path: Path, progress_callback=None) -> str:
+    """Upload one audio file to Gemini, wait for processing and transcribe it"""
+    print(f"Uploading audio file: {segment_path} ({segment_path.stat().st_size / 1024 / 1024:.1f} MB)")
+    audio_file = call_gemini(client.files.upload, file=str(segment_path))
+    print(f"Upload complete, file state: {_file_state(audio_file)}")
+
+    try:
+        audio_file = _wait_for_file(client, audio_file)
+
+        if _file_state(audio_file) == "FAILED":
+            raise Exception("העיבוד של קובץ האודיו נכשל בשרת של Google")
+
+        if _file_state(audio_file) == "PROCESSING":
+            raise Exception("תם הזמן לעיבוד קובץ האודיו")
+
+        if progress_callback:
+            progress_callback("transcribing")
+
+        response = call_gemini(
+            client.models.generate_content,
             model="gemini-2.5-flash",
-            contents=[prompt, audio_file]
+            contents=[_TRANSCRIBE_PROMPT, audio_file]
         )
 
         if not response or not response.text:
             raise Exception("לא התקבלה תשובה מ-Gemini")
 
-        print(f"Transcription complete! Length: {len(response.text)} chars")
+        return response.text
+    finally:
+        delete_uploaded_file(client, audio_file.name)
+
 
-        # Cleanup
+def delete_uploaded_file(client, name: str):
+    """
+    Remove an uploaded file from Gemini in a daemon thread - nothing waits
+    for the ack, and Gemini expires uploads on its own if the process exits first
+    """
+    def _delete():
         try:
-            client.files.delete(name=audio_file.name)
-        except:
+            client.files.delete(name=name)
+        except Exception:
             pass
 
-        return response.text
+    threading.Thread(target=_delete, daemon=True).start()
+
+
+def transcribe_with_gemini(audio_path: Path, progress_callback=None, api_key: str = None) -> str:
+    """
+    Transcribe audio with Gemini API.
+    Long audio is split into 10-minute segments that are transcribed in
+    parallel and stitched back together with shifted timestamps.
+    """
+    if not api_key:
+        api_key = os.getenv("GEMINI_API_KEY")
+
+    if not api_key:
+        print("ERROR: No API key provided for transcription")
+        raise ValueError("נדרש מפתח API לתמלול. הזן מפתח בהגדרות.")
+
+    # Validate audio file exists
+    audio_path = Path(audio_path)
+    if not audio_path.exists():
+        raise FileNotFoundError(f"קובץ האודיו לא נמצא: {audio_path}")
+
+    temp_dir = None
+    try:
+        client = get_genai_client(api_key)
+        temp_dir = tempfile.mkdtemp()
+
+        # Segments get ASCII names in temp_dir (important for file upload)
+        segments = _split_mp3(audio_path, Path(temp_dir))
+        if not segments:
+            # ASCII-named symlink instead of copying the whole file
+            temp_path = Path(temp_dir) / "podcast_audio.mp3"
+            try:
+                os.symlink(audio_path.resolve(), temp_path)
+            except OSError:
+                shutil.copy2(audio_path, temp_path)  # No symlink support (e.g. Windows)
+            segments = [temp_path]
+
+        if progress_callback:
+            progress_callback("uploading")
+
+        print(f"Starting transcription with Gemini 3 Pro... ({len(segments)} segment(s))")
+
+        with ThreadPoolExecutor(max_workers=min(TRANSCRIBE_WORKERS, len(segments))) as executor:
+            texts = list(executor.map(lambda seg: _transcribe_segment(client, seg, progress_callback), segments))
+
+        transcript = "\n\n".join(
+            _offset_timestamps(text.strip(), i * TRANSCRIBE_SEGMENT_SECONDS)
+            for i, text in enumerate(texts)
+        )
+
+        print(f"Transcription complete! Length: {len(transcript)} chars")
+        return transcript
 
     except Exception as e:
         print(f"Transcription error: {e}")
         raise
     finally:
-        # Always cleanup temp directory
+        # Always cleanup temp directory, off the request path
         if temp_dir:
-            try:
-                shutil.rmtree(temp_dir)
-            except:
-                pass
+            threading.Thread(target=shutil.rmtree, args=(temp_dir,),
+                             kwargs={"ignore_errors": True}, daemon=True).start()
+
+
+# =============================================================================
+# Topic Extraction & Post Generation (Explain Protocol)
+# =============================================================================
+
+TAPLINK_URL = "https://dvirlinkai.taplink.ws/"
+WHATSAPP_GROUP_LINK = "https://chat.whatsapp.com/DIyQ3SPLVb93oHqajN0B5S?mode=hqrc"
+PHONE_NUMBER = "0585777177"
+
+# Full signature for posts
+POST_SIGNATURE = """
+אם אהבתם וקיבלתם ערך מהפוסט - 🌹 יעשה לי את היום
+
+להזמנת לליווי אישי, הרצאה, סדנה או ייעוץ להטמעת כלי בינה מלאכותית ואוטומציות אצלכם בארגון צרו איתי קשר בווצאפ - 0585777177 👂
+יש לכם.ן חברים שעדיין לא בקבוצות בהן אני שולח תכנים נגישים על בינה מלאכותית? שלחו להם שיצטרפו 👇🏼
+https://chat.whatsapp.com/DIyQ3SPLVb93oHqajN0B5S?mode=hqrc
+דביר - ExplAIn לומדים בינה מלאכותית בגובה האוזניים 👂 ובכיף.
+
+https://dvirlinkai.taplink.ws/ 🌹
+"""
+
+# Static post prompt skeleton - the signature is filled in once at import time
+_POST_PROMPT_SKELETON = """אתה דביר מ-ExplAIn. כתוב פוסט וואטסאפ מפורט ואיכותי.
+
+**הנושא:**
+$title
+$summary
+$quote_section$hook_section
+
+**מי אתה - דביר:**
+- מומחה AI שמדבר בגובה העיניים, לא מתנשא
+- מסביר הכל בפשטות, כמו שמדברים בחיי היום-יום
+- לא יוצא מנקודת הנחה שאנשים יודעים - מסביר כל שלב
+- נותן ערך אמיתי ופרקטי
+- כותב פוסטים ארוכים ומפורטים - אנשים קוראים!
+
+**מבנה הפוסט (חובה!):**
+
+📌 **כותרת:**
+פורמט: 🛑 [כותרת קליטה] 🛑
+הכותרת צריכה למשוך - לספר מה יקבלו (למשל: "3 טיפים ל-X שאתם חייבים להכיר")
+
+📌 **פתיחה (2-3 משפטים):**
+שאלה או אמירה שיוצרת הזדהות
+דוגמה: "חשבתם שאתם מכירים את X? היום אני רוצה לצלול איתכם לניואנסים הקטנים."
+
+📌 **גוף הפוסט - סעיפים ממוספרים:**
+כל סעיף במבנה:
+[אימוג'י] [מספר]. "[כותרת משנה קליטה]"
+[הסבר מפורט - מה הבעיה? מה הפתרון? איך עושים את זה צעד אחר צעד?]
+[טיפ ספציפי שאפשר ליישם]
+
+דוגמה לסעיף:
+📊 1. "למה הוא לא נותן לי להעלות אקסל?!"
+מכירים את זה שאתם מנסים לגרור קובץ Excel והוא מסרב? מתסכל.
+הפתרון הפשוט: תעלו את האקסל ל-Google Sheets, שמרו, ואז בתוך הכלי תבחרו ב"Google Drive" -> "Sheets".
+זה עובד חלק, והוא קורא את הנתונים מעולה.
+
+📌 **בונוס (אופציונלי):**
+💎 בונוס למתקדמים: [טיפ נוסף מתקדם]
+
+📌 **סיום:**
+- קריאה לפעולה: "יאללה, לכו לנסות ותגידו לי איך עבד לכם 👇"
+- או: "קשה? ממש לא. לכו לנסות!"
+
+📌 **חתימה קבועה (בדיוק ככה!):**
+$signature
+
+**חוקים קריטיים:**
+1. פוסט ארוך ומפורט - תסביר הכל צעד אחר צעד
+2. אל תצא מנקודת הנחה שאנשים יודעים - תסביר איך מגיעים לכל דבר
+3. הדגשות = *כוכבית אחת* בלבד (לא שתיים!)
+4. אימוג'ים לסימון סעיפים: 📊 🗑️ ⚙️ 💡 💎 ⚠️
+5. כותרות משנה במירכאות: "למה זה חשוב?"
+6. שפה פשוטה, כמו שמדברים עם חבר
+7. דוגמאות קונקרטיות - לא תיאוריה יבשה
+
+**כתוב את הפוסט:**"""
+_POST_PROMPT_TPL = string.Template(
+    string.Template(_POST_PROMPT_SKELETON).safe_substitute(signature=POST_SIGNATURE)
+)
+
+class Topic(BaseModel):
+    """A post-worthy topic extracted from a transcript"""
+    title: str
+    summary: str
+    quote: str | None = None
+    why_interesting: str
+    key_points: list[str]
+    hook_idea: str
 
 
-# =============================================================================
-# Topic Extraction & Post Generation (Explain Protocol)
-# =============================================================================
+class TopicList(BaseModel):
+    topics: list[Topic]
 
-TAPLINK_URL = "https://dvirlinkai.taplink.ws/"
-WHATSAPP_GROUP_LINK = "https://chat.whatsapp.com/DIyQ3SPLVb93oHqajN0B5S?mode=hqrc"
-PHONE_NUMBER = "0585777177"
 
-# Full signature for posts
-POST_SIGNATURE = """
-אם אהבתם וקיבלתם ערך מהפוסט - 🌹 יעשה לי את היום
+TOPIC_CONTEXT_LIMIT = 30000  # Longer transcripts are summarized before topic extraction
+SUMMARY_CHUNK_CHARS = 10000
+SUMMARY_WORKERS = 4
 
-להזמנת לליווי אישי, הרצאה, סדנה או ייעוץ להטמעת כלי בינה מלאכותית ואוטומציות אצלכם בארגון צרו איתי קשר בווצאפ - 0585777177 👂
-יש לכם.ן חברים שעדיין לא בקבוצות בהן אני שולח תכנים נגישים על בינה מלאכותית? שלחו להם שיצטרפו 👇🏼
-https://chat.whatsapp.com/DIyQ3SPLVb93oHqajN0B5S?mode=hqrc
-דביר - ExplAIn לומדים בינה מלאכותית בגובה האוזניים 👂 ובכיף.
+_SUMMARY_PROMPT = """סכם את קטע התמלול הבא בעברית, בתמציתיות.
+
+- שמור על כל טיפ, כלי, שיטה, דוגמה, אזהרה או תובנה מפתיעה
+- שמור ציטוטים חשובים מילה במילה, במרכאות
+- השמט חזרות, שיחת חולין ופרסומות
+- אל תוסיף מידע שלא מופיע בקטע
+
+## הקטע:
 
-https://dvirlinkai.taplink.ws/ 🌹
 """
 
+
+def _split_paragraphs(text: str, target: int = SUMMARY_CHUNK_CHARS) -> list:
+    """Group paragraphs into windows of about `target` chars, never splitting a paragraph"""
+    chunks = []
+    current = []
+    size = 0
+    for paragraph in text.split("\n\n"):
+        if current and size + len(paragraph) > target:
+            chunks.append("\n\n".join(current))
+            current = []
+            size = 0
+        current.append(paragraph)
+        size += len(paragraph) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _summarize_chunk(client, chunk: str) -> str:
+    """Condense one transcript window, keeping quotes and specifics"""
+    response = call_gemini(
+        client.models.generate_content,
+        model="gemini-2.5-flash",
+        contents=[_SUMMARY_PROMPT + chunk]
+    )
+    return response.text.strip()
+
+
 def extract_topics_from_transcript(transcript: str, api_key: str = None) -> list:
     """
     מנתח את התמלול לעומק ומחלץ נושאים לפוסטים.
@@ -414,11 +1443,18 @@ def extract_topics_from_transcript(transcript: str, api_key: str = None) -> list
     print(f"Starting topic extraction... Transcript length: {len(transcript)} chars")
 
     try:
-        from google import genai
-        client = genai.Client(api_key=api_key)
-
-        # Use a focused portion of the transcript
-        transcript_to_analyze = transcript[:30000] if len(transcript) > 30000 else transcript
+        from google.genai import types
+        client = get_genai_client(api_key)
+
+        # Long episodes: summarize paragraph windows in parallel so the whole
+        # episode is covered instead of just its first 30K chars
+        transcript_to_analyze = transcript
+        if len(transcript) > TOPIC_CONTEXT_LIMIT:
+            chunks = _split_paragraphs(transcript)
+            print(f"Summarizing {len(chunks)} chunks before topic extraction...")
+            with ThreadPoolExecutor(max_workers=SUMMARY_WORKERS) as pool:
+                summaries = list(pool.map(lambda chunk: _summarize_chunk(client, chunk), chunks))
+            transcript_to_analyze = "\n\n".join(summaries)
 
         prompt = f"""אתה מנתח תוכן מקצועי עם ניסיון בשיווק דיגיטלי ובינה מלאכותית.
 
@@ -484,46 +1520,25 @@ def extract_topics_from_transcript(transcript: str, api_key: str = None) -> list
 - החזר רק JSON, בלי הסברים"""
 
         print("Sending request to Gemini...")
-        response = client.models.generate_content(
+        response = call_gemini(
+            client.models.generate_content,
             model="gemini-2.5-flash",
-            contents=[prompt]
+            contents=[prompt],
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=TopicList
+            )
         )
 
-        response_text = response.text
-        print(f"Got response from Gemini. Length: {len(response_text)} chars")
-
-        # Debug: print first 500 chars of response
-        print(f"Response preview: {response_text[:500]}...")
-
-        # Extract JSON from response
-        json_str = None
-
-        # Try to find JSON in markdown code block first
-        json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1)
-            print("Found JSON in markdown code block")
-        else:
-            # Try to find raw JSON
-            json_match = re.search(r'\{[\s\S]*"topics"[\s\S]*\}', response_text)
-            if json_match:
-                json_str = json_match.group(0)
-                print("Found raw JSON")
-            else:
-                print(f"ERROR: Could not find JSON in response: {response_text[:1000]}")
-                return []
-
-        # Parse JSON
-        try:
-            data = json.loads(json_str)
-            topics = data.get("topics", [])
-            print(f"Successfully parsed {len(topics)} topics")
-            return topics
-        except json.JSONDecodeError as je:
-            print(f"JSON parse error: {je}")
-            print(f"Problematic JSON: {json_str[:500]}...")
+        parsed = response.parsed
+        if parsed is None:
+            print(f"ERROR: Response did not match the topics schema: {(response.text or '')[:1000]}")
             return []
 
+        topics = [topic.model_dump() for topic in parsed.topics]
+        print(f"Successfully parsed {len(topics)} topics")
+        return topics
+
     except Exception as e:
         print(f"Topic extraction error: {type(e).__name__}: {e}")
         import traceback
@@ -542,79 +1557,33 @@ def generate_post_for_topic(topic: dict, podcast_name: str, episode_name: str, a
         return None
 
     try:
-        from google import genai
-        client = genai.Client(api_key=api_key)
+        client = get_genai_client(api_key)
 
         # Get hook idea if available from topic extraction
         hook_idea = topic.get('hook_idea', '')
-        hook_section = f"\nרעיון להוק: {hook_idea}" if hook_idea else ""
-
-        prompt = f"""אתה דביר מ-ExplAIn. כתוב פוסט וואטסאפ מפורט ואיכותי.
-
-**הנושא:**
-{topic.get('title', '')}
-{topic.get('summary', '')}
-{f"ציטוט מהתמלול: {topic.get('quote')}" if topic.get('quote') else ""}{hook_section}
-
-**מי אתה - דביר:**
-- מומחה AI שמדבר בגובה העיניים, לא מתנשא
-- מסביר הכל בפשטות, כמו שמדברים בחיי היום-יום
-- לא יוצא מנקודת הנחה שאנשים יודעים - מסביר כל שלב
-- נותן ערך אמיתי ופרקטי
-- כותב פוסטים ארוכים ומפורטים - אנשים קוראים!
-
-**מבנה הפוסט (חובה!):**
-
-📌 **כותרת:**
-פורמט: 🛑 [כותרת קליטה] 🛑
-הכותרת צריכה למשוך - לספר מה יקבלו (למשל: "3 טיפים ל-X שאתם חייבים להכיר")
-
-📌 **פתיחה (2-3 משפטים):**
-שאלה או אמירה שיוצרת הזדהות
-דוגמה: "חשבתם שאתם מכירים את X? היום אני רוצה לצלול איתכם לניואנסים הקטנים."
-
-📌 **גוף הפוסט - סעיפים ממוספרים:**
-כל סעיף במבנה:
-[אימוג'י] [מספר]. "[כותרת משנה קליטה]"
-[הסבר מפורט - מה הבעיה? מה הפתרון? איך עושים את זה צעד אחר צעד?]
-[טיפ ספציפי שאפשר ליישם]
-
-דוגמה לסעיף:
-📊 1. "למה הוא לא נותן לי להעלות אקסל?!"
-מכירים את זה שאתם מנסים לגרור קובץ Excel והוא מסרב? מתסכל.
-הפתרון הפשוט: תעלו את האקסל ל-Google Sheets, שמרו, ואז בתוך הכלי תבחרו ב"Google Drive" -> "Sheets".
-זה עובד חלק, והוא קורא את הנתונים מעולה.
-
-📌 **בונוס (אופציונלי):**
-💎 בונוס למתקדמים: [טיפ נוסף מתקדם]
-
-📌 **סיום:**
-- קריאה לפעולה: "יאללה, לכו לנסות ותגידו לי איך עבד לכם 👇"
-- או: "קשה? ממש לא. לכו לנסות!"
-
-📌 **חתימה קבועה (בדיוק ככה!):**
-{POST_SIGNATURE}
-
-**חוקים קריטיים:**
-1. פוסט ארוך ומפורט - תסביר הכל צעד אחר צעד
-2. אל תצא מנקודת הנחה שאנשים יודעים - תסביר איך מגיעים לכל דבר
-3. הדגשות = *כוכבית אחת* בלבד (לא שתיים!)
-4. אימוג'ים לסימון סעיפים: 📊 🗑️ ⚙️ 💡 💎 ⚠️
-5. כותרות משנה במירכאות: "למה זה חשוב?"
-6. שפה פשוטה, כמו שמדברים עם חבר
-7. דוגמאות קונקרטיות - לא תיאוריה יבשה
+        quote = topic.get('quote')
 
-**כתוב את הפוסט:**"""
-
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=[prompt]
+        prompt = _POST_PROMPT_TPL.substitute(
+            title=topic.get('title', ''),
+            summary=topic.get('summary', ''),
+            quote_section=f"ציטוט מהתמלול: {quote}" if quote else "",
+            hook_section=f"\nרעיון להוק: {hook_idea}" if hook_idea else ""
         )
 
-        post_text = response.text
+        # The infographic prompt only depends on the topic - generate it alongside the post
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            infographic_future = pool.submit(
+                generate_infographic_prompt_with_ai, topic, podcast_name, episode_name, api_key
+            )
+
+            response = call_gemini(
+                client.models.generate_content,
+                model="gemini-2.5-flash",
+                contents=[prompt]
+            )
 
-        # Now generate infographic prompt using AI for better results
-        infographic_prompt = generate_infographic_prompt_with_ai(topic, podcast_name, episode_name, api_key)
+            post_text = response.text
+            infographic_prompt = infographic_future.result()
 
         return {
             "post": post_text,
@@ -742,7 +1711,8 @@ Style: Clean, tech-oriented, professional. Strong visual hierarchy from Right to
         genai.configure(api_key=api_key)
         model = genai.GenerativeModel("gemini-2.5-flash")
 
-        response = model.generate_content(
+        response = call_gemini(
+            model.generate_content,
             f"{system_prompt}\n\n---\n\n{user_prompt}",
             generation_config=genai.types.GenerationConfig(
                 temperature=0.7,
@@ -760,9 +1730,11 @@ Style: Clean, tech-oriented, professional. Strong visual hierarchy from Right to
 # History Management
 # =============================================================================
 
-# History storage (in production, use database)
+# History storage - a Redis list shared by all workers, or a local file without Redis
 transcription_history = []
 HISTORY_FILE = SCRIPT_DIR / "history.json"
+HISTORY_KEY = f"{CACHE_KEY_PREFIX}history"
+HISTORY_LIMIT = 50
 
 def load_history():
     """Load history from file"""
@@ -778,7 +1750,7 @@ def save_history():
     """Save history to file"""
     try:
         with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
-            json.dump(transcription_history[-50:], f, ensure_ascii=False, indent=2)  # Keep last 50
+            json.dump(transcription_history[:HISTORY_LIMIT], f, ensure_ascii=False, indent=2)  # Keep newest 50
     except:
         pass
 
@@ -793,54 +1765,90 @@ def add_to_history(job_data):
         "completed_at": datetime.now().isoformat(),
         "has_transcript": bool(job_data.get("transcript_path"))
     }
+    if redis_client:
+        pipe = redis_client.pipeline()
+        pipe.lpush(HISTORY_KEY, orjson.dumps(history_entry))
+        pipe.ltrim(HISTORY_KEY, 0, HISTORY_LIMIT - 1)
+        pipe.execute()
+        return
+
     transcription_history.insert(0, history_entry)
     save_history()
 
+def get_history_entries(limit: int) -> list:
+    """Newest history entries first"""
+    if redis_client:
+        return [orjson.loads(raw) for raw in redis_client.lrange(HISTORY_KEY, 0, limit - 1)]
+    return transcription_history[:limit]
+
+def remove_from_history(job_id: str):
+    """Remove all history entries for a job"""
+    global transcription_history
+    if redis_client:
+        for raw in redis_client.lrange(HISTORY_KEY, 0, -1):
+            if orjson.loads(raw).get('id') == job_id:
+                redis_client.lrem(HISTORY_KEY, 0, raw)
+        return
+
+    transcription_history = [h for h in transcription_history if h.get('id') != job_id]
+    save_history()
+
 # Load history on startup
-load_history()
+if not redis_client:
+    load_history()
 
 
 # =============================================================================
 # Background Processing
 # =============================================================================
 
+# Bounded pool for background jobs - extra submissions wait in the queue
+job_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("MAX_CONCURRENT_JOBS", 8)),
+    thread_name_prefix="job"
+)
+
+
 def process_podcast_job(job_id: str, spotify_url: str, api_key: str = None):
     """Process podcast in background"""
-    job = jobs[job_id]
     # Use provided api_key or get from job
     if not api_key:
-        api_key = job.get('api_key')
+        api_key = (job_store.get(job_id) or {}).get('api_key')
 
     try:
         # Step 1: Extract IDs
-        job["status"] = "extracting"
-        job["message"] = "מחלץ מידע מהלינק..."
+        job_store.update(job_id, status="extracting", message="מחלץ מידע מהלינק...")
 
         ids = extract_spotify_ids(spotify_url)
         if not ids["episode_id"]:
-            job["status"] = "error"
-            job["message"] = "לא הצלחתי לחלץ Episode ID מהלינק"
+            job_store.update(job_id, status="error", message="לא הצלחתי לחלץ Episode ID מהלינק")
             return
 
-        job["episode_id"] = ids["episode_id"]
+        job_store.update(job_id, episode_id=ids["episode_id"])
 
         # Step 2: Get podcast info
-        job["status"] = "searching"
-        job["message"] = "מחפש את הפודקאסט..."
+        job_store.update(job_id, status="searching", message="מחפש את הפודקאסט...")
+
+        # One embed page fetch gives both the show ID and the titles
+        podcast_info = get_podcast_info_from_spotify(ids["episode_id"])
 
-        show_id = ids.get("show_id") or get_show_id_from_episode(ids["episode_id"])
+        show_id = ids.get("show_id") or podcast_info.get("show_id")
         if not show_id:
-            job["status"] = "error"
-            job["message"] = "לא הצלחתי למצוא את הפודקאסט. ייתכן שזה Spotify Exclusive."
+            job_store.update(
+                job_id,
+                status="error",
+                message="לא הצלחתי למצוא את הפודקאסט. ייתכן שזה Spotify Exclusive.",
+            )
             return
 
-        podcast_info = get_podcast_info_from_spotify(ids["episode_id"])
-        job["episode_title"] = podcast_info.get("episode_title", "Unknown")
-        job["show_title"] = podcast_info.get("show_title", "Unknown")
+        job_store.update(
+            job_id,
+            episode_title=podcast_info.get("episode_title", "Unknown"),
+            show_title=podcast_info.get("show_title", "Unknown"),
+        )
 
         # Step 3: Find RSS feed
-        job["status"] = "finding_rss"
-        job["message"] = "מחפש RSS feed..."
+        job_store.update(job_id, status="finding_rss", message="מחפש RSS feed...")
 
         rss_url = None
         if podcast_info.get("show_title"):
@@ -849,28 +1857,29 @@ def process_podcast_job(job_id: str, spotify_url: str, api_key: str = None):
         if not rss_url:
             rss_url = f"https://spotifeed.timdorr.com/{show_id}"
 
-        feed = fetch_rss_feed(rss_url)
-        if not feed or not feed.entries:
-            job["status"] = "error"
-            job["message"] = "לא הצלחתי לקבל RSS feed"
-            return
+        # Step 4: Find episode - stream the feed and stop at the matching item
+        job_store.update(job_id, status="finding_episode", message="מחפש את הפרק...")
+
+        episode, feed_title = find_episode_streaming(rss_url, ids["episode_id"], podcast_info.get("episode_title"))
 
-        show_title = feed.feed.get('title', podcast_info.get("show_title", "podcast"))
+        if not episode:
+            # Fall back to a full parse (Atom feeds, episode not matched while streaming)
+            feed = fetch_rss_feed(rss_url)
+            if not feed or not feed.entries:
+                job_store.update(job_id, status="error", message="לא הצלחתי לקבל RSS feed")
+                return
 
-        # Step 4: Find episode
-        job["status"] = "finding_episode"
-        job["message"] = "מחפש את הפרק..."
+            feed_title = feed.feed.get('title')
+            episode = find_episode_in_rss(feed, ids["episode_id"], podcast_info.get("episode_title"))
+
+        show_title = feed_title or podcast_info.get("show_title") or "podcast"
 
-        episode = find_episode_in_rss(feed, ids["episode_id"], podcast_info.get("episode_title"))
         if not episode or not episode.get("mp3_url"):
-            job["status"] = "error"
-            job["message"] = "לא הצלחתי למצוא את הפרק או את קובץ ה-MP3"
+            job_store.update(job_id, status="error", message="לא הצלחתי למצוא את הפרק או את קובץ ה-MP3")
             return
 
         # Step 5: Download MP3
-        job["status"] = "downloading"
-        job["message"] = "מוריד את הפודקאסט..."
-        job["download_progress"] = 0
+        job_store.update(job_id, status="downloading", message="מוריד את הפודקאסט...", download_progress=0)
 
         date_str = datetime.now().strftime("%Y%m%d")
         safe_show = sanitize_filename(show_title)[:30]
@@ -879,36 +1888,35 @@ def process_podcast_job(job_id: str, spotify_url: str, api_key: str = None):
         mp3_path = DOWNLOADS_DIR / mp3_filename
 
         def download_progress(percent):
-            job["download_progress"] = percent
+            job_store.update(job_id, download_progress=percent)
 
         if not download_mp3(episode["mp3_url"], mp3_path, download_progress):
-            job["status"] = "error"
-            job["message"] = "שגיאה בהורדת הקובץ"
+            job_store.update(job_id, status="error", message="שגיאה בהורדת הקובץ")
             return
 
-        job["mp3_path"] = str(mp3_path)
-        job["mp3_filename"] = mp3_filename
+        job_store.update(job_id, mp3_path=str(mp3_path), mp3_filename=mp3_filename)
 
         # Step 6: Transcribe
-        job["status"] = "transcribing"
-        job["message"] = "מתמלל את הפודקאסט... (זה יכול לקחת כמה דקות)"
+        job_store.update(
+            job_id,
+            status="transcribing",
+            message="מתמלל את הפודקאסט... (זה יכול לקחת כמה דקות)",
+        )
 
         def transcribe_progress(stage):
             if stage == "uploading":
-                job["message"] = "מעלה קובץ לשרת..."
+                job_store.update(job_id, message="מעלה קובץ לשרת...")
             elif stage == "transcribing":
-                job["message"] = "מתמלל... אנא המתן"
+                job_store.update(job_id, message="מתמלל... אנא המתן")
 
         try:
             transcript = transcribe_with_gemini(mp3_path, transcribe_progress, api_key)
         except Exception as e:
-            job["status"] = "error"
-            job["message"] = f"שגיאה בתמלול: {str(e)}"
+            job_store.update(job_id, status="error", message=f"שגיאה בתמלול: {str(e)}")
             return
 
         if not transcript:
-            job["status"] = "error"
-            job["message"] = "התמלול נכשל - לא התקבל טקסט"
+            job_store.update(job_id, status="error", message="התמלול נכשל - לא התקבל טקסט")
             return
 
         # Save transcript
@@ -926,23 +1934,24 @@ def process_podcast_job(job_id: str, spotify_url: str, api_key: str = None):
 
 """
 
-        with open(transcript_path, 'w', encoding='utf-8') as f:
-            f.write(header + transcript)
+        with open(transcript_path, 'wb', buffering=1 << 20) as f:
+            f.write(header.encode('utf-8'))
+            f.write(transcript.encode('utf-8'))
 
-        job["transcript_path"] = str(transcript_path)
-        job["transcript_filename"] = transcript_filename
-        job["transcript_preview"] = transcript[:500] + "..." if len(transcript) > 500 else transcript
+        job_store.update(
+            job_id,
+            transcript_path=str(transcript_path),
+            transcript_filename=transcript_filename,
+            transcript_preview=transcript[:500] + "..." if len(transcript) > 500 else transcript,
+        )
 
-        job["status"] = "completed"
-        job["message"] = "הושלם בהצלחה!"
-        job["type"] = "spotify"
+        job_store.update(job_id, status="completed", message="הושלם בהצלחה!", type="spotify")
 
         # Add to history
-        add_to_history(job)
+        add_to_history(job_store.get(job_id))
 
     except Exception as e:
-        job["status"] = "error"
-        job["message"] = f"שגיאה: {str(e)}"
+        job_store.update(job_id, status="error", message=f"שגיאה: {str(e)}")
 
 
 # =============================================================================
@@ -951,12 +1960,8 @@ def process_podcast_job(job_id: str, spotify_url: str, api_key: str = None):
 
 def extract_youtube_id(url: str) -> str:
     """Extract YouTube video ID from URL"""
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-        r'youtube\.com\/shorts\/([a-zA-Z0-9_-]{11})',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in _YOUTUBE_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
     return None
@@ -1030,42 +2035,43 @@ def download_youtube_audio(video_id: str, output_path: Path, progress_callback=N
 
 def process_youtube_job(job_id: str, youtube_url: str, api_key: str = None):
     """Process YouTube video in background"""
-    job = jobs[job_id]
     if not api_key:
-        api_key = job.get('api_key')
+        api_key = (job_store.get(job_id) or {}).get('api_key')
 
     try:
         # Step 1: Extract video ID
-        job["status"] = "extracting"
-        job["message"] = "מחלץ מידע מהלינק..."
+        job_store.update(job_id, status="extracting", message="מחלץ מידע מהלינק...")
 
         video_id = extract_youtube_id(youtube_url)
         if not video_id:
-            job["status"] = "error"
-            job["message"] = "לא הצלחתי לחלץ את מזהה הסרטון מהלינק"
+            job_store.update(job_id, status="error", message="לא הצלחתי לחלץ את מזהה הסרטון מהלינק")
             return
 
-        job["video_id"] = video_id
+        job_store.update(job_id, video_id=video_id)
 
         # Step 2: Get video info
-        job["status"] = "searching"
-        job["message"] = "מקבל מידע על הסרטון..."
+        job_store.update(job_id, status="searching", message="מקבל מידע על הסרטון...")
 
         video_info = get_youtube_info(video_id)
         if not video_info:
-            job["status"] = "error"
-            job["message"] = "לא הצלחתי לקבל מידע על הסרטון"
+            job_store.update(job_id, status="error", message="לא הצלחתי לקבל מידע על הסרטון")
             return
 
-        job["video_title"] = video_info["title"]
-        job["channel"] = video_info["channel"]
-        job["show_title"] = video_info["title"]  # For compatibility
-        job["episode_title"] = video_info["channel"]
+        job_store.update(
+            job_id,
+            video_title=video_info["title"],
+            channel=video_info["channel"],
+            show_title=video_info["title"],  # For compatibility
+            episode_title=video_info["channel"],
+        )
 
         # Step 3: Download audio
-        job["status"] = "downloading"
-        job["message"] = "מוריד את האודיו מהסרטון..."
-        job["download_progress"] = 0
+        job_store.update(
+            job_id,
+            status="downloading",
+            message="מוריד את האודיו מהסרטון...",
+            download_progress=0,
+        )
 
         date_str = datetime.now().strftime("%Y%m%d")
         safe_title = sanitize_filename(video_info["title"])[:50]
@@ -1073,37 +2079,35 @@ def process_youtube_job(job_id: str, youtube_url: str, api_key: str = None):
         mp3_path = DOWNLOADS_DIR / mp3_filename
 
         def download_progress(percent):
-            job["download_progress"] = percent
+            job_store.update(job_id, download_progress=percent)
 
         if not download_youtube_audio(video_id, mp3_path, download_progress):
-            job["status"] = "error"
-            job["message"] = "שגיאה בהורדת האודיו. ייתכן שהסרטון מוגן או לא זמין."
+            job_store.update(
+                job_id,
+                status="error",
+                message="שגיאה בהורדת האודיו. ייתכן שהסרטון מוגן או לא זמין.",
+            )
             return
 
-        job["mp3_path"] = str(mp3_path)
-        job["mp3_filename"] = mp3_filename
-        job["download_progress"] = 100
+        job_store.update(job_id, mp3_path=str(mp3_path), mp3_filename=mp3_filename, download_progress=100)
 
         # Step 4: Transcribe
-        job["status"] = "transcribing"
-        job["message"] = "מתמלל את הסרטון... (זה יכול לקחת כמה דקות)"
+        job_store.update(job_id, status="transcribing", message="מתמלל את הסרטון... (זה יכול לקחת כמה דקות)")
 
         def transcribe_progress(stage):
             if stage == "uploading":
-                job["message"] = "מעלה קובץ לשרת..."
+                job_store.update(job_id, message="מעלה קובץ לשרת...")
             elif stage == "transcribing":
-                job["message"] = "מתמלל עם Gemini 3 Pro..."
+                job_store.update(job_id, message="מתמלל עם Gemini 3 Pro...")
 
         try:
             transcript = transcribe_with_gemini(mp3_path, transcribe_progress, api_key)
         except Exception as e:
-            job["status"] = "error"
-            job["message"] = f"שגיאה בתמלול: {str(e)}"
+            job_store.update(job_id, status="error", message=f"שגיאה בתמלול: {str(e)}")
             return
 
         if not transcript:
-            job["status"] = "error"
-            job["message"] = "התמלול נכשל - לא התקבל טקסט"
+            job_store.update(job_id, status="error", message="התמלול נכשל - לא התקבל טקסט")
             return
 
         # Save transcript
@@ -1121,23 +2125,93 @@ def process_youtube_job(job_id: str, youtube_url: str, api_key: str = None):
 
 """
 
-        with open(transcript_path, 'w', encoding='utf-8') as f:
-            f.write(header + transcript)
+        with open(transcript_path, 'wb', buffering=1 << 20) as f:
+            f.write(header.encode('utf-8'))
+            f.write(transcript.encode('utf-8'))
 
-        job["transcript_path"] = str(transcript_path)
-        job["transcript_filename"] = transcript_filename
-        job["transcript_preview"] = transcript[:500] + "..." if len(transcript) > 500 else transcript
+        job_store.update(
+            job_id,
+            transcript_path=str(transcript_path),
+            transcript_filename=transcript_filename,
+            transcript_preview=transcript[:500] + "..." if len(transcript) > 500 else transcript,
+        )
 
-        job["status"] = "completed"
-        job["message"] = "הושלם בהצלחה!"
-        job["type"] = "youtube"
+        job_store.update(job_id, status="completed", message="הושלם בהצלחה!", type="youtube")
 
         # Add to history
-        add_to_history(job)
+        add_to_history(job_store.get(job_id))
 
     except Exception as e:
-        job["status"] = "error"
-        job["message"] = f"שגיאה: {str(e)}"
+        job_store.update(job_id, status="error", message=f"שגיאה: {str(e)}")
+
+
+# =============================================================================
+# Job Dispatch
+# =============================================================================
+
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
+
+
+def make_celery():
+    """
+    Celery app for running jobs in separate worker processes.
+    Opt-in via CELERY_BROKER_URL; needs Redis job storage so workers and web share state.
+    """
+    if not CELERY_BROKER_URL:
+        return None
+    if not redis_client:
+        print("CELERY_BROKER_URL is set but Redis job storage is unavailable - running jobs in-process")
+        return None
+
+    from celery import Celery
+    celery_app = Celery("podcast", broker=CELERY_BROKER_URL)
+    celery_app.conf.task_default_queue = "podcast"
+    celery_app.conf.worker_prefetch_multiplier = 1  # Jobs are long - don't hoard them
+    return celery_app
+
+
+celery = make_celery()
+_celery_tasks = {}
+if celery:
+    for _job in (process_podcast_job, process_youtube_job):
+        _celery_tasks[_job] = celery.task(name=f"podcast.{_job.__name__}")(_job)
+
+
+def submit_job(job, job_id: str, url: str, api_key: str):
+    """Run a background job on a Celery worker if configured, otherwise on the local pool"""
+    task = _celery_tasks.get(job)
+    if task:
+        # Keep the key out of the broker - the worker reads it from the job store
+        task.delay(job_id, url)
+    else:
+        job_executor.submit(job, job_id, url, api_key)
+
+
+# =============================================================================
+# Node Scripts
+# =============================================================================
+
+def run_node_script(script_dir: Path, script: str, args: list, timeout: int) -> subprocess.CompletedProcess:
+    """
+    Run one of the skills' TypeScript scripts (image generation, WhatsApp).
+
+    Uses the precompiled dist/<name>.js with plain node when it exists (build it
+    once with `npx tsc --outDir dist` in the scripts directory). Otherwise falls
+    back to ts-node; --transpile-only skips type-checking, most of its startup time.
+    """
+    compiled = script_dir / "dist" / f"{Path(script).stem}.js"
+    if compiled.exists():
+        cmd = ["node", str(compiled)]
+    else:
+        cmd = ["npx", "ts-node", "--transpile-only", script]
+
+    return subprocess.run(
+        [*cmd, *args],
+        cwd=str(script_dir),
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
 
 
 # =============================================================================
@@ -1201,7 +2275,7 @@ def start_processing():
 
     # Create job
     job_id = str(uuid.uuid4())
-    jobs[job_id] = {
+    job_store.create(job_id, {
         "id": job_id,
         "url": spotify_url,
         "status": "starting",
@@ -1213,12 +2287,10 @@ def start_processing():
         "transcript_path": None,
         "download_progress": 0,
         "api_key": api_key  # Store API key for background processing
-    }
+    })
 
     # Start background processing
-    thread = threading.Thread(target=process_podcast_job, args=(job_id, spotify_url, api_key))
-    thread.daemon = True
-    thread.start()
+    submit_job(process_podcast_job, job_id, spotify_url, api_key)
 
     return jsonify({"job_id": job_id})
 
@@ -1243,7 +2315,7 @@ def start_youtube_processing():
 
     # Create job
     job_id = str(uuid.uuid4())
-    jobs[job_id] = {
+    job_store.create(job_id, {
         "id": job_id,
         "url": youtube_url,
         "type": "youtube",
@@ -1256,12 +2328,10 @@ def start_youtube_processing():
         "transcript_path": None,
         "download_progress": 0,
         "api_key": api_key
-    }
+    })
 
     # Start background processing
-    thread = threading.Thread(target=process_youtube_job, args=(job_id, youtube_url, api_key))
-    thread.daemon = True
-    thread.start()
+    submit_job(process_youtube_job, job_id, youtube_url, api_key)
 
     return jsonify({"job_id": job_id})
 
@@ -1269,15 +2339,13 @@ def start_youtube_processing():
 @app.route('/api/history', methods=['GET'])
 def get_history():
     """Get transcription history"""
-    return jsonify({"history": transcription_history[:20]})
+    return jsonify({"history": get_history_entries(20)})
 
 
 @app.route('/api/history/<job_id>', methods=['DELETE'])
 def delete_history_item(job_id):
     """Delete item from history"""
-    global transcription_history
-    transcription_history = [h for h in transcription_history if h.get('id') != job_id]
-    save_history()
+    remove_from_history(job_id)
     return jsonify({"success": True})
 
 
@@ -1292,14 +2360,12 @@ def update_post():
     if not all([job_id, topic_index is not None, edited_post]):
         return jsonify({"error": "Missing required fields"}), 400
 
-    job = jobs.get(job_id)
+    job = job_store.get(job_id)
     if not job:
         return jsonify({"error": "Job not found"}), 404
 
     # Store edited post
-    if 'edited_posts' not in job:
-        job['edited_posts'] = {}
-    job['edited_posts'][str(topic_index)] = edited_post
+    job_store.set_item(job_id, 'edited_posts', str(topic_index), edited_post)
 
     return jsonify({"success": True, "post": edited_post})
 
@@ -1307,26 +2373,84 @@ def update_post():
 @app.route('/api/status/<job_id>')
 def get_status(job_id):
     """Get job status"""
-    job = jobs.get(job_id)
+    job = job_store.get(job_id)
     if not job:
         return jsonify({"error": "Job not found"}), 404
 
     return jsonify(job)
 
 
+# When running behind nginx, hand file bodies to it instead of streaming them
+# through Python. Set to the internal location prefix, e.g. "/_internal", with:
+#   location /_internal/downloads/        { internal; alias /app/downloads/; }
+#   location /_internal/generated_images/ { internal; alias /app/static/generated_images/; }
+X_ACCEL_PREFIX = os.getenv("X_ACCEL_PREFIX", "").rstrip("/")
+
+
+def send_local_file(path, base_dir: Path, mimetype: str, download_name: str = None, max_age: int = None):
+    """send_file, or an X-Accel-Redirect to nginx when X_ACCEL_PREFIX is configured"""
+    path = Path(path)
+    if not X_ACCEL_PREFIX or path.parent.resolve() != base_dir.resolve():
+        return send_file(
+            path,
+            mimetype=mimetype,
+            as_attachment=download_name is not None,
+            download_name=download_name,
+            conditional=True,
+            max_age=max_age
+        )
+
+    # nginx serves the bytes (including Range requests) from its internal location
+    response = Response(mimetype=mimetype)
+    response.headers["X-Accel-Redirect"] = f"{X_ACCEL_PREFIX}/{base_dir.name}/{quote(path.name)}"
+    if download_name:
+        response.headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{quote(download_name)}"
+    if max_age:
+        response.headers["Cache-Control"] = f"public, max-age={max_age}"
+    return response
+
+
+@app.route('/api/stream/<job_id>')
+def stream_status(job_id):
+    """Push job status as Server-Sent Events until the job finishes"""
+    if not job_store.get(job_id):
+        return jsonify({"error": "Job not found"}), 404
+
+    def events():
+        last_payload = None
+        for _ in job_store.watch(job_id):
+            job = job_store.get(job_id)
+            if job is None:
+                break
+
+            payload = app.json.dumps(job).encode()
+            if payload != last_payload:
+                last_payload = payload
+                yield b"data: " + payload + b"\n\n"
+            else:
+                yield b": keepalive\n\n"
+
+            if job.get("status") in ("completed", "error"):
+                break
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.route('/api/download/<job_id>/<file_type>')
 def download_file(job_id, file_type):
     """Download MP3 or transcript"""
-    job = jobs.get(job_id)
+    job = job_store.get(job_id)
     if not job:
         return jsonify({"error": "Job not found"}), 404
 
     if file_type == "mp3" and job.get("mp3_path"):
-        return send_file(
-            job["mp3_path"],
-            as_attachment=True,
-            download_name=job["mp3_filename"]
-        )
+        # Range requests get 206 Partial Content, so players can seek and
+        # interrupted downloads can resume (from Flask or from nginx)
+        return send_local_file(job["mp3_path"], DOWNLOADS_DIR, "audio/mpeg", download_name=job["mp3_filename"])
     elif file_type == "transcript" and job.get("transcript_path"):
         return send_file(
             job["transcript_path"],
@@ -1339,11 +2463,18 @@ def download_file(job_id, file_type):
 
 @app.route('/api/transcript/<job_id>')
 def get_transcript(job_id):
-    """Get full transcript text"""
-    job = jobs.get(job_id)
+    """Get full transcript text (?format=raw streams the file as text/plain)"""
+    job = job_store.get(job_id)
     if not job or not job.get("transcript_path"):
         return jsonify({"error": "Transcript not found"}), 404
 
+    if request.args.get("format") == "raw":
+        return send_file(
+            job["transcript_path"],
+            mimetype="text/plain; charset=utf-8",
+            conditional=True
+        )
+
     try:
         with open(job["transcript_path"], 'r', encoding='utf-8') as f:
             content = f.read()
@@ -1355,7 +2486,7 @@ def get_transcript(job_id):
 @app.route('/api/extract-topics/<job_id>', methods=['POST'])
 def extract_topics(job_id):
     """Extract topics from transcript for post generation"""
-    job = jobs.get(job_id)
+    job = job_store.get(job_id)
     if not job:
         return jsonify({"error": "Job not found"}), 404
 
@@ -1366,33 +2497,39 @@ def extract_topics(job_id):
     if job.get("topics"):
         return jsonify({"topics": job["topics"]})
 
-    try:
-        with open(job["transcript_path"], 'r', encoding='utf-8') as f:
-            transcript = f.read()
+    with job_lock(job_id, "topics"):
+        # Another request may have extracted them while we waited
+        job = job_store.get(job_id) or job
+        if job.get("topics"):
+            return jsonify({"topics": job["topics"]})
 
-        # Get API key from job or request
-        api_key = job.get('api_key') or get_api_key()
-        if not api_key:
-            return jsonify({"error": "נדרש מפתח API"}), 400
+        try:
+            with open(job["transcript_path"], 'r', encoding='utf-8') as f:
+                transcript = f.read()
 
-        topics = extract_topics_from_transcript(transcript, api_key)
+            # Get API key from job or request
+            api_key = job.get('api_key') or get_api_key()
+            if not api_key:
+                return jsonify({"error": "נדרש מפתח API"}), 400
 
-        if not topics:
-            return jsonify({"error": "לא הצלחתי לחלץ נושאים מהתמלול"}), 500
+            topics = extract_topics_from_transcript(transcript, api_key)
 
-        # Store topics in job
-        job["topics"] = topics
+            if not topics:
+                return jsonify({"error": "לא הצלחתי לחלץ נושאים מהתמלול"}), 500
 
-        return jsonify({"topics": topics})
+            # Store topics in job
+            job_store.update(job_id, topics=topics)
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+            return jsonify({"topics": topics})
+
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
 
 
 @app.route('/api/generate-post/<job_id>/<int:topic_index>', methods=['POST'])
 def generate_single_post(job_id, topic_index):
     """Generate a post for a specific topic"""
-    job = jobs.get(job_id)
+    job = job_store.get(job_id)
     if not job:
         return jsonify({"error": "Job not found"}), 404
 
@@ -1403,37 +2540,44 @@ def generate_single_post(job_id, topic_index):
     topic = topics[topic_index]
 
     # Check if post already generated
-    if "posts" not in job:
-        job["posts"] = {}
-
-    if str(topic_index) in job["posts"]:
-        return jsonify(job["posts"][str(topic_index)])
+    posts = job.get("posts", {})
+    if str(topic_index) in posts:
+        return jsonify(posts[str(topic_index)])
 
     # Get API key from job or request
     api_key = job.get('api_key') or get_api_key()
     if not api_key:
         return jsonify({"error": "נדרש מפתח API"}), 400
 
-    result = generate_post_for_topic(
-        topic,
-        job.get("show_title", "פודקאסט"),
-        job.get("episode_title", "פרק"),
-        api_key
-    )
+    with job_lock(job_id, "posts", topic_index):
+        # Another request may have generated it while we waited
+        posts = (job_store.get(job_id) or job).get("posts", {})
+        if str(topic_index) in posts:
+            return jsonify(posts[str(topic_index)])
+
+        result = generate_post_for_topic(
+            topic,
+            job.get("show_title", "פודקאסט"),
+            job.get("episode_title", "פרק"),
+            api_key
+        )
 
-    if not result:
-        return jsonify({"error": "לא הצלחתי ליצור פוסט"}), 500
+        if not result:
+            return jsonify({"error": "לא הצלחתי ליצור פוסט"}), 500
 
-    # Store generated post
-    job["posts"][str(topic_index)] = result
+        # Store generated post
+        job_store.set_item(job_id, "posts", str(topic_index), result)
 
     return jsonify(result)
 
 
+POST_WORKERS = 8
+
+
 @app.route('/api/generate-all-posts/<job_id>', methods=['POST'])
 def generate_all_posts(job_id):
     """Generate posts for all topics"""
-    job = jobs.get(job_id)
+    job = job_store.get(job_id)
     if not job:
         return jsonify({"error": "Job not found"}), 404
 
@@ -1446,29 +2590,31 @@ def generate_all_posts(job_id):
     if not api_key:
         return jsonify({"error": "נדרש מפתח API"}), 400
 
-    if "posts" not in job:
-        job["posts"] = {}
-
-    results = []
-
-    for i, topic in enumerate(topics):
-        # Skip if already generated
-        if str(i) in job["posts"]:
-            results.append(job["posts"][str(i)])
-            continue
-
-        result = generate_post_for_topic(
-            topic,
-            job.get("show_title", "פודקאסט"),
-            job.get("episode_title", "פרק"),
-            api_key
-        )
+    posts = job.get("posts", {})
+    results = [posts.get(str(i)) for i in range(len(topics))]
+    pending = [i for i, result in enumerate(results) if result is None]
+
+    def generate(i):
+        with job_lock(job_id, "posts", i):
+            existing = (job_store.get(job_id) or {}).get("posts", {}).get(str(i))
+            if existing:
+                return existing
+
+            result = generate_post_for_topic(
+                topics[i],
+                job.get("show_title", "פודקאסט"),
+                job.get("episode_title", "פרק"),
+                api_key
+            )
+            if result:
+                job_store.set_item(job_id, "posts", str(i), result)
+            return result
 
-        if result:
-            job["posts"][str(i)] = result
-            results.append(result)
-        else:
-            results.append({"error": f"Failed to generate post for topic {i}"})
+    # Each post is an independent Gemini round trip - run them side by side
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(POST_WORKERS, len(pending))) as pool:
+            for i, result in zip(pending, pool.map(generate, pending)):
+                results[i] = result or {"error": f"Failed to generate post for topic {i}"}
 
     return jsonify({"posts": results})
 
@@ -1492,7 +2638,7 @@ def generate_image():
         nano_banana_dir = Path.home() / ".claude" / "skills" / "nano-banana-poster" / "scripts"
 
         # Create images directory if not exists
-        images_dir = SCRIPT_DIR / "static" / "generated_images"
+        images_dir = IMAGES_DIR
         images_dir.mkdir(parents=True, exist_ok=True)
 
         # Generate unique filename
@@ -1504,18 +2650,11 @@ def generate_image():
         print(f"[IMAGE] Clean prompt: {clean_prompt[:200]}...")
 
         # Run nano-banana-poster with 2:3 aspect ratio (vertical for WhatsApp)
-        cmd = [
-            "npx", "ts-node", "generate_poster.ts",
-            "--aspect", "2:3",
-            clean_prompt
-        ]
-
         print(f"[IMAGE] Running command in: {nano_banana_dir}")
-        result = subprocess.run(
-            cmd,
-            cwd=str(nano_banana_dir),
-            capture_output=True,
-            text=True,
+        result = run_node_script(
+            nano_banana_dir,
+            "generate_poster.ts",
+            ["--aspect", "2:3", clean_prompt],
             timeout=120  # 2 minutes timeout for image generation
         )
         print(f"[IMAGE] Command finished. Return code: {result.returncode}")
@@ -1554,11 +2693,17 @@ def generate_image():
         return jsonify({"error": f"שגיאה ביצירת התמונה: {error_msg}"}), 500
 
 
+IMAGE_MAX_AGE = 365 * 86400
+
+
 @app.route('/static/generated_images/<filename>')
 def serve_generated_image(filename):
     """Serve generated images"""
-    images_dir = SCRIPT_DIR / "static" / "generated_images"
-    return send_file(images_dir / filename, mimetype='image/png')
+    # Filenames are timestamped and never overwritten - let browsers keep them
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response = send_local_file(IMAGES_DIR / filename, IMAGES_DIR, mimetype, max_age=IMAGE_MAX_AGE)
+    response.cache_control.immutable = True
+    return response
 
 
 # =============================================================================
@@ -1580,25 +2725,16 @@ def send_whatsapp_message():
         return jsonify({"error": "No phone or group_id provided"}), 400
 
     try:
-        # Build command
-        script_path = WHATSAPP_SCRIPTS_DIR / "send-message.ts"
-        cmd = ["npx", "ts-node", str(script_path)]
-
+        # Build arguments
         if group_id:
-            cmd.extend(["--group", group_id])
+            args = ["--group", group_id]
         else:
-            cmd.extend(["--phone", phone])
+            args = ["--phone", phone]
 
-        cmd.extend(["--message", message])
+        args.extend(["--message", message])
 
         # Run the script
-        result = subprocess.run(
-            cmd,
-            cwd=str(WHATSAPP_SCRIPTS_DIR),
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        result = run_node_script(WHATSAPP_SCRIPTS_DIR, "send-message.ts", args, timeout=30)
 
         if result.returncode == 0:
             return jsonify({
@@ -1639,28 +2775,19 @@ def send_whatsapp_image():
         return jsonify({"error": f"Image not found: {image_path}"}), 400
 
     try:
-        # Build command
-        script_path = WHATSAPP_SCRIPTS_DIR / "send-image.ts"
-        cmd = ["npx", "ts-node", str(script_path)]
-
+        # Build arguments
         if group_id:
-            cmd.extend(["--phone", group_id])  # send-image uses --phone for both
+            args = ["--phone", group_id]  # send-image uses --phone for both
         else:
-            cmd.extend(["--phone", phone])
+            args = ["--phone", phone]
 
-        cmd.extend(["--image", image_path])
+        args.extend(["--image", image_path])
 
         if caption:
-            cmd.extend(["--caption", caption])
+            args.extend(["--caption", caption])
 
         # Run the script
-        result = subprocess.run(
-            cmd,
-            cwd=str(WHATSAPP_SCRIPTS_DIR),
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
+        result = run_node_script(WHATSAPP_SCRIPTS_DIR, "send-image.ts", args, timeout=60)
 
         if result.returncode == 0:
             return jsonify({
@@ -1678,6 +2805,74 @@ def send_whatsapp_image():
         return jsonify({"error": str(e)}), 500
 
 
+class RateLimiter:
+    """Token bucket - allows `rate` calls per `per` seconds, blocking callers beyond that"""
+
+    def __init__(self, rate: float, per: float = 1.0):
+        self.rate = rate
+        self.per = per
+        self._tokens = rate
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate / self.per)
+            self._last = now
+            # Reserve a token now, even if it has to be waited for
+            self._tokens -= 1
+            wait = -self._tokens * self.per / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+# Avoid WhatsApp rate limiting across concurrent group sends
+whatsapp_limiter = RateLimiter(float(os.getenv("WHATSAPP_SENDS_PER_SECOND", 1)))
+
+
+def _send_to_group(group: dict, abs_image_path: str, post_text: str) -> dict:
+    """Send one post to one group and report the result"""
+    group_id = group["id"]
+    group_name = group["name"]
+
+    try:
+        whatsapp_limiter.acquire()
+
+        if abs_image_path:
+            # Send image with caption (ONE message)
+            args = ["--phone", group_id, "--image", abs_image_path]
+
+            if post_text:
+                args.extend(["--caption", post_text])
+
+            result = run_node_script(WHATSAPP_SCRIPTS_DIR, "send-image.ts", args, timeout=60)
+
+            return {
+                "group": group_name,
+                "success": result.returncode == 0,
+                "type": "image+caption"
+            }
+
+        # Text only
+        args = ["--group", group_id, "--message", post_text]
+
+        result = run_node_script(WHATSAPP_SCRIPTS_DIR, "send-message.ts", args, timeout=30)
+
+        return {
+            "group": group_name,
+            "success": result.returncode == 0,
+            "type": "text"
+        }
+
+    except Exception as e:
+        return {
+            "group": group_name,
+            "success": False,
+            "error": str(e)
+        }
+
+
 @app.route('/api/whatsapp/send-post', methods=['POST'])
 def send_whatsapp_post():
     """Send a complete post (image + text as caption) to WhatsApp - ONE message per group"""
@@ -1702,64 +2897,9 @@ def send_whatsapp_post():
         if abs_image_path and not os.path.exists(abs_image_path):
             return jsonify({"error": f"Image not found: {abs_image_path}"}), 400
 
-    results = []
-
-    # Send to all configured groups
-    for group in WHATSAPP_GROUPS:
-        group_id = group["id"]
-        group_name = group["name"]
-
-        try:
-            if abs_image_path:
-                # Send image with caption (ONE message)
-                script_path = WHATSAPP_SCRIPTS_DIR / "send-image.ts"
-                cmd = ["npx", "ts-node", str(script_path), "--phone", group_id, "--image", abs_image_path]
-
-                if post_text:
-                    cmd.extend(["--caption", post_text])
-
-                result = subprocess.run(
-                    cmd,
-                    cwd=str(WHATSAPP_SCRIPTS_DIR),
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-
-                results.append({
-                    "group": group_name,
-                    "success": result.returncode == 0,
-                    "type": "image+caption"
-                })
-
-            else:
-                # Text only
-                script_path = WHATSAPP_SCRIPTS_DIR / "send-message.ts"
-                cmd = ["npx", "ts-node", str(script_path), "--group", group_id, "--message", post_text]
-
-                result = subprocess.run(
-                    cmd,
-                    cwd=str(WHATSAPP_SCRIPTS_DIR),
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-
-                results.append({
-                    "group": group_name,
-                    "success": result.returncode == 0,
-                    "type": "text"
-                })
-
-            # Small delay between groups to avoid rate limiting
-            time.sleep(1)
-
-        except Exception as e:
-            results.append({
-                "group": group_name,
-                "success": False,
-                "error": str(e)
-            })
+    # Send to all configured groups in parallel - the limiter spaces out the actual sends
+    with ThreadPoolExecutor(max_workers=min(8, len(WHATSAPP_GROUPS))) as pool:
+        results = list(pool.map(lambda group: _send_to_group(group, abs_image_path, post_text), WHATSAPP_GROUPS))
 
     # Check overall success
     all_success = all(r.get("success", False) for r in results)
@@ -14,14 +14,23 @@ Spotify Podcast Downloader + Hebrew Transcription
 import os
 import re
 import sys
-import json
+import random
+import shutil
 import time
+import hashlib
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urlparse, urljoin, quote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import feedparser
+import orjson
+from lxml import etree
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
@@ -32,16 +41,40 @@ load_dotenv()
 SCRIPT_DIR = Path(__file__).parent
 DOWNLOADS_DIR = SCRIPT_DIR / "downloads"
 TRANSCRIPTS_DIR = SCRIPT_DIR / "transcripts"
+CACHE_DIR = SCRIPT_DIR / "cache"
+PODCAST_CONCURRENCY = int(os.getenv("PODCAST_CONCURRENCY", 4))  # כמה פרקים מעובדים במקביל
 
 # צור תיקיות אם לא קיימות
 DOWNLOADS_DIR.mkdir(exist_ok=True)
 TRANSCRIPTS_DIR.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
 
 # User Agent לבקשות HTTP
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
+# ביטויים רגולריים מקומפלים מראש
+_SHOW_ID_RES = [
+    re.compile(r'"showUri":"spotify:show:([a-zA-Z0-9]{22})"'),
+    re.compile(r'spotify:show:([a-zA-Z0-9]{22})'),
+    re.compile(r'/show/([a-zA-Z0-9]{22})'),
+]
+_NEXT_DATA_RE = re.compile(r'<script id="__NEXT_DATA__" type="application/json">(.+?)</script>')
+_FILENAME_BAD_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Session משותף - שומר חיבורי TCP/TLS פתוחים בין הבקשות לספוטיפיי, iTunes וה-RSS
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+_http_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+SESSION.mount('https://', _http_adapter)
+SESSION.mount('http://', _http_adapter)
+
 
 def print_step(emoji: str, message: str):
     """הדפסת הודעה עם אייקון"""
@@ -58,6 +91,33 @@ def print_success(message: str):
     print(f"\n✅ {message}")
 
 
+def ttl_cache(ttl: int):
+    """
+    זוכר תוצאות של פונקציה עם ארגומנט אחד למשך ttl שניות.
+    תוצאות ריקות (None / dict בלי ערכים) לא נשמרות - ננסה שוב בפעם הבאה.
+    """
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(arg):
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(arg)
+                if hit and hit[0] > now:
+                    return hit[1]
+
+            value = func(arg)
+            if value and (not isinstance(value, dict) or any(value.values())):
+                with lock:
+                    cache[arg] = (now + ttl, value)
+            return value
+
+        return wrapper
+    return decorator
+
+
 # =============================================================================
 # שלב 1: חילוץ מידע מלינק ספוטיפיי
 # =============================================================================
@@ -106,38 +166,16 @@ def extract_spotify_ids(url: str) -> dict:
 
 def get_show_id_from_episode(episode_id: str) -> str:
     """
-    מקבל Show ID מתוך Episode ID על ידי scraping של דף ה-embed
+    מקבל Show ID מתוך Episode ID - מאותה בקשה לדף ה-embed שמחזירה גם את שמות הפרק והפודקאסט
     """
-    # השתמש בדף embed שמכיל מידע סטטי (לא JavaScript)
-    url = f"https://open.spotify.com/embed/episode/{episode_id}"
-
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        response.raise_for_status()
-        html_text = response.text
-
-        # חפש show ID בפורמטים שונים
-        patterns = [
-            r'"showUri":"spotify:show:([a-zA-Z0-9]{22})"',
-            r'spotify:show:([a-zA-Z0-9]{22})',
-            r'/show/([a-zA-Z0-9]{22})',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, html_text)
-            if match:
-                return match.group(1)
-
-    except Exception as e:
-        print_error(f"לא הצלחתי לגשת לדף הפרק: {e}")
-
-    return None
+    return get_podcast_info_from_spotify(episode_id)["show_id"]
 
 
 # =============================================================================
 # שלב 2: מציאת RSS Feed
 # =============================================================================
 
+@ttl_cache(ttl=24 * 3600)
 def get_rss_from_itunes(podcast_name: str) -> str:
     """
     מחפש RSS feed אמיתי דרך iTunes Search API
@@ -147,7 +185,7 @@ def get_rss_from_itunes(podcast_name: str) -> str:
         encoded_name = quote(podcast_name)
         itunes_url = f"https://itunes.apple.com/search?term={encoded_name}&media=podcast&entity=podcast&limit=5"
 
-        response = requests.get(itunes_url, timeout=15)
+        response = SESSION.get(itunes_url, timeout=15)
         data = response.json()
 
         results = data.get('results', [])
@@ -182,6 +220,7 @@ def get_rss_from_spotifeed(show_id: str) -> str:
     return f"https://spotifeed.timdorr.com/{show_id}"
 
 
+@ttl_cache(ttl=3600)
 def get_podcast_info_from_spotify(episode_id: str) -> dict:
     """
     מקבל מידע על הפודקאסט מדף ה-embed של ספוטיפיי
@@ -196,14 +235,14 @@ def get_podcast_info_from_spotify(episode_id: str) -> dict:
     try:
         # קבל מידע מדף ה-embed שמכיל __NEXT_DATA__ עם כל המידע
         embed_url = f"https://open.spotify.com/embed/episode/{episode_id}"
-        response = requests.get(embed_url, headers=HEADERS, timeout=15)
+        response = SESSION.get(embed_url, timeout=15)
         response.raise_for_status()
         html = response.text
 
         # חלץ JSON מ-__NEXT_DATA__
-        match = re.search(r'<script id="__NEXT_DATA__" type="application/json">(.+?)</script>', html)
+        match = _NEXT_DATA_RE.search(html)
         if match:
-            data = json.loads(match.group(1))
+            data = orjson.loads(match.group(1))
             entity = data.get('props', {}).get('pageProps', {}).get('state', {}).get('data', {}).get('entity', {})
 
             if entity:
@@ -216,11 +255,13 @@ def get_podcast_info_from_spotify(episode_id: str) -> dict:
                 if 'spotify:show:' in related_uri:
                     info["show_id"] = related_uri.split(':')[-1]
 
-        # גיבוי: חפש show ID בכל ה-HTML
+        # גיבוי: חפש show ID בכל ה-HTML בפורמטים שונים
         if not info["show_id"]:
-            match = re.search(r'spotify:show:([a-zA-Z0-9]{22})', html)
-            if match:
-                info["show_id"] = match.group(1)
+            for pattern in _SHOW_ID_RES:
+                match = pattern.search(html)
+                if match:
+                    info["show_id"] = match.group(1)
+                    break
 
     except Exception as e:
         print(f"    (לא הצלחתי לקבל מידע נוסף: {e})")
@@ -228,19 +269,262 @@ def get_podcast_info_from_spotify(episode_id: str) -> dict:
     return info
 
 
-def fetch_rss_feed(rss_url: str) -> feedparser.FeedParserDict:
+ITUNES_NS = '{http://www.itunes.com/dtds/podcast-1.0.dtd}'
+
+
+def _rss_item_entry(item) -> dict:
+    """
+    ממיר <item> של RSS לרשומה עם השדות שהקוד קורא, באותם שמות כמו ב-feedparser.
+    dict רגיל ולא FeedParserDict - שם enclosures מחושב מ-links ומפתח שנקבע ישירות לא נראה
+    """
+    entry = {
+        "id": (item.findtext('guid') or '').strip(),
+        "link": (item.findtext('link') or '').strip(),
+        "itunes_duration": (item.findtext(f'{ITUNES_NS}duration') or '').strip(),
+        "published": (item.findtext('pubDate') or '').strip(),
+        "summary": (item.findtext('description') or '').strip(),
+        "enclosures": [
+            {"href": enc.get('url', ''), "type": enc.get('type', '')}
+            for enc in item.iterfind('enclosure')
+        ],
+    }
+    title = item.findtext('title')
+    if title is not None:
+        entry["title"] = title.strip()
+    return entry
+
+
+def _make_feed(title: str, entries: list, etag: str = None, modified: str = None) -> feedparser.FeedParserDict:
+    """
+    feed במבנה של feedparser (feed.feed / feed.entries) סביב רשומות שכבר פוענחו
+    """
+    return feedparser.FeedParserDict(
+        feed=feedparser.FeedParserDict(title=title), entries=entries,
+        etag=etag, modified=modified,
+    )
+
+
+def _parse_rss(content: bytes) -> feedparser.FeedParserDict:
+    """
+    מפענח RSS 2.0 עם lxml - רק השדות שהקוד קורא, באותו מבנה של feedparser.
+    מחזיר None אם זה לא RSS (למשל Atom) - ואז נשתמש ב-feedparser.
+    """
+    root = etree.fromstring(content, parser=etree.XMLParser(huge_tree=True, recover=True))
+    channel = root.find('channel') if root is not None and root.tag == 'rss' else None
+    if channel is None:
+        return None
+
+    entries = [_rss_item_entry(item) for item in channel.iterfind('item')]
+    return _make_feed((channel.findtext('title') or '').strip(), entries)
+
+
+def fetch_rss_feed(rss_url: str, cached: dict = None) -> feedparser.FeedParserDict:
     """
     מוריד ומפענח RSS feed
+
+    אם יש רשומת מטמון - שולח If-None-Match / If-Modified-Since,
+    ואם השרת עונה 304 (לא השתנה) מחזיר את ה-feed מהמטמון בלי להוריד כלום
     """
     try:
-        response = requests.get(rss_url, headers=HEADERS, timeout=30)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers['If-None-Match'] = cached["etag"]
+            if cached.get("last_modified"):
+                headers['If-Modified-Since'] = cached["last_modified"]
+
+        response = SESSION.get(rss_url, headers=headers, timeout=30)
+        if response.status_code == 304 and cached:
+            return feed_from_cache(cached)
         response.raise_for_status()
-        return feedparser.parse(response.content)
+
+        feed = _parse_feed_response(response)
+        feed['etag'] = response.headers.get('ETag')
+        feed['modified'] = response.headers.get('Last-Modified')
+        return feed
     except Exception as e:
         print_error(f"לא הצלחתי להוריד RSS feed: {e}")
         return None
 
 
+def _parse_feed_response(response) -> feedparser.FeedParserDict:
+    """
+    מפענח תשובת RSS - lxml ל-RSS רגיל, feedparser לכל השאר
+    """
+    try:
+        feed = _parse_rss(response.content)
+    except etree.XMLSyntaxError:
+        feed = None
+    if feed is not None:
+        return feed
+
+    return feedparser.parse(
+        response.content,
+        response_headers={'content-type': response.headers.get('content-type', '')}
+    )
+
+
+def stream_episode_from_rss(rss_url: str, episode_id: str, episode_title: str = None) -> tuple:
+    """
+    קורא את ה-RSS כ-stream ועוצר ברגע שנמצא הפרק (לפי guid/לינק או כותרת מדויקת),
+    כך שבפיד גדול לא מורידים ומפענחים את כל הפרקים
+
+    Returns:
+        tuple: (entry, feed) - entry הוא הפרק שנמצא או None;
+               feed מכיל את הפרקים שנקראו - חלקי אם עצרנו מוקדם (entry לא None),
+               מלא אם ה-stream נקרא עד הסוף, או None בכישלון / כשזה לא RSS
+    """
+    title_lower = episode_title.lower().strip() if episode_title else None
+    feed_title = ''
+    entries = []
+
+    try:
+        with SESSION.get(rss_url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            etag = response.headers.get('ETag')
+            modified = response.headers.get('Last-Modified')
+
+            for _, item in etree.iterparse(response.raw, events=('end',), tag='item',
+                                           huge_tree=True, recover=True):
+                channel = item.getparent()
+                if not entries and channel is not None:
+                    feed_title = (channel.findtext('title') or '').strip()
+
+                entry = _rss_item_entry(item)
+                entries.append(entry)
+
+                # שחרור הזיכרון - ה-item והאחים שלפניו כבר לא נחוצים
+                item.clear()
+                while channel is not None and item.getprevious() is not None:
+                    del channel[0]
+
+                if (episode_id in entry['id'] or episode_id in entry['link']
+                        or (title_lower and entry.get('title', '').lower().strip() == title_lower)):
+                    return entry, _make_feed(feed_title, entries, etag, modified)
+    except Exception as e:
+        print(f"    (קריאת ה-RSS כ-stream נכשלה: {e})")
+        return None, None
+
+    # לא RSS (למשל Atom) - נחזור להורדה המלאה עם feedparser
+    if not entries:
+        return None, None
+
+    return None, _make_feed(feed_title, entries, etag, modified)
+
+
+def _index_entries(entries) -> tuple:
+    """
+    מעבר אחד על ה-feed: מילונים לחיפוש לפי guid/לינק/כותרת (הפרק הראשון קובע)
+    ורשימת (guid, link, title, entry) מנורמלת לחיפוש חלקי
+    """
+    by_id = {}
+    by_title = {}
+    rows = []
+    for entry in entries:
+        guid = str(entry.get('id', '') or entry.get('guid', ''))
+        link = str(entry.get('link', ''))
+        title = entry.get('title', '').lower().strip()
+        by_id.setdefault(guid, entry)
+        by_id.setdefault(link, entry)
+        by_title.setdefault(title, entry)
+        rows.append((guid, link, title, entry))
+    return by_id, by_title, rows
+
+
+RSS_CACHE_TTL = 15 * 60  # כמה זמן feed שמור נחשב טרי (שניות)
+LAST_GOOD_RSS_TTL = 7 * 24 * 3600  # כמה זמן סומכים על RSS שכבר נתן MP3 תקין
+
+
+def _rss_cache_path(show_id: str) -> Path:
+    return CACHE_DIR / f"{hashlib.md5(show_id.encode()).hexdigest()}.json"
+
+
+def _slim_entry(entry) -> dict:
+    """
+    רק השדות ש-find_episode_in_rss ו-extract_episode_data קוראים
+    """
+    return {
+        "id": str(entry.get('id', '') or entry.get('guid', '')),
+        "link": entry.get('link', ''),
+        "title": entry.get('title', 'unknown'),
+        "itunes_duration": entry.get('itunes_duration', ''),
+        "published": entry.get('published', ''),
+        "summary": (entry.get('summary') or '')[:200],
+        "enclosures": [
+            {"href": enc.get('href', '') or enc.get('url', ''), "type": enc.get('type', '')}
+            for enc in entry.get('enclosures') or []
+        ],
+    }
+
+
+def load_rss_cache(show_id: str) -> tuple:
+    """
+    טוען feed שמור מהדיסק
+
+    Returns:
+        tuple: (record, age) - age בשניות, או (None, None) אם אין מטמון
+    """
+    path = _rss_cache_path(show_id)
+    try:
+        record = orjson.loads(path.read_bytes())
+        fetched_at = record.get("fetched_at") or path.stat().st_mtime
+        return record, time.time() - fetched_at
+    except (OSError, orjson.JSONDecodeError):
+        return None, None
+
+
+def save_rss_cache(show_id: str, rss_url: str, feed: feedparser.FeedParserDict, complete: bool = True):
+    """
+    שומר את ה-feed (בגרסה מצומצמת) לדיסק.
+    complete=False - רק הפרקים עד הפרק שנמצא (stream שעצר מוקדם); פרק שלא נמצא
+    ברשומה כזו לא אומר שהוא לא קיים, ו-304 עליה לא מחזיר את שאר הפרקים
+    """
+    record, _ = load_rss_cache(show_id)
+    record = record or {}
+    record.update(
+        rss_url=rss_url,
+        feed_title=feed.feed.get('title', ''),
+        etag=feed.get('etag'),
+        last_modified=feed.get('modified'),
+        fetched_at=time.time(),
+        complete=complete,
+        entries=[_slim_entry(entry) for entry in feed.entries],
+    )
+    _write_rss_cache(show_id, record)
+
+
+def mark_rss_url_good(show_id: str, rss_url: str):
+    """
+    זוכר איזה RSS באמת נתן MP3 תקין לפודקאסט הזה - בפעם הבאה נלך אליו ישר
+    בלי iTunes ו-Spotifeed
+    """
+    record, _ = load_rss_cache(show_id)
+    record = record or {}
+    record.update(last_good_rss_url=rss_url, last_good_at=time.time())
+    _write_rss_cache(show_id, record)
+
+
+def _write_rss_cache(show_id: str, record: dict):
+    try:
+        _rss_cache_path(show_id).write_bytes(orjson.dumps(record))
+    except OSError:
+        pass
+
+
+def feed_from_cache(record: dict) -> feedparser.FeedParserDict:
+    """
+    בונה feed במבנה של feedparser מרשומת מטמון
+    """
+    # dict רגילים - ב-FeedParserDict המפתח enclosures לא נראה (הוא מחושב מ-links)
+    return _make_feed(
+        record.get("feed_title", ''),
+        [dict(entry) for entry in record["entries"]],
+        record.get("etag"),
+        record.get("last_modified"),
+    )
+
+
 def find_episode_in_rss(feed: feedparser.FeedParserDict, episode_id: str, episode_title: str = None) -> dict:
     """
     מוצא פרק ספציפי ב-RSS feed
@@ -252,26 +536,24 @@ def find_episode_in_rss(feed: feedparser.FeedParserDict, episode_id: str, episod
     if not feed or not feed.entries:
         return None
 
-    # חפש לפי episode ID
-    for entry in feed.entries:
-        # בדוק ב-guid
-        guid = entry.get('id', '') or entry.get('guid', '')
-        if episode_id in str(guid):
-            return extract_episode_data(entry)
+    by_id, by_title, rows = _index_entries(feed.entries)
 
-        # בדוק בלינק
-        link = entry.get('link', '')
-        if episode_id in str(link):
-            return extract_episode_data(entry)
+    # חפש לפי episode ID - קודם התאמה מדויקת ל-guid/לינק, אחר כך הכלה
+    entry = by_id.get(episode_id)
+    if entry is None:
+        entry = next((e for guid, link, _, e in rows if episode_id in guid or episode_id in link), None)
+    if entry is not None:
+        return extract_episode_data(entry)
 
-    # חפש לפי כותרת (אם יש)
+    # חפש לפי כותרת (אם יש) - קודם התאמה מדויקת, אחר כך חלקית
     if episode_title:
         episode_title_lower = episode_title.lower().strip()
-        for entry in feed.entries:
-            entry_title = entry.get('title', '').lower().strip()
-            # התאמה מדויקת או חלקית
-            if episode_title_lower == entry_title or episode_title_lower in entry_title or entry_title in episode_title_lower:
-                return extract_episode_data(entry)
+        entry = by_title.get(episode_title_lower)
+        if entry is None:
+            entry = next((e for _, _, title, e in rows
+                          if episode_title_lower in title or title in episode_title_lower), None)
+        if entry is not None:
+            return extract_episode_data(entry)
 
     # אם לא מצאנו, נחזיר את הפרק האחרון (לפעמים זה עובד)
     # אבל רק אם יש פרק אחד או שניים
@@ -319,50 +601,171 @@ def extract_episode_data(entry) -> dict:
     return data
 
 
+@functools.lru_cache(maxsize=256)
 def sanitize_filename(name: str) -> str:
     """
     מנקה שם קובץ מתווים בעייתיים
     """
     # הסר תווים לא חוקיים
-    name = re.sub(r'[<>:"/\\|?*]', '', name)
+    name = _FILENAME_BAD_CHARS_RE.sub('', name)
     # הסר רווחים מיותרים
-    name = re.sub(r'\s+', ' ', name).strip()
+    name = _WHITESPACE_RE.sub(' ', name).strip()
     # קצר אם צריך
     if len(name) > 100:
         name = name[:100]
     return name
 
 
+@functools.lru_cache(maxsize=256)
+def ascii_filename(name: str) -> str:
+    """
+    גרסת ASCII של שם קובץ - תווים שאינם ASCII (למשל עברית) מושמטים
+    """
+    name = sanitize_filename(name.encode('ascii', 'ignore').decode())
+    return name.replace(' ', '_')
+
+
 # =============================================================================
 # שלב 3: הורדת MP3
 # =============================================================================
 
+PARALLEL_DOWNLOAD_PARTS = 4  # מספר חיבורים מקבילים להורדה
+
+
+def _probe_download(url: str) -> tuple:
+    """
+    בקשת HEAD - מחזירה (URL סופי, גודל, האם השרת תומך ב-Range)
+    """
+    try:
+        head = SESSION.head(url, allow_redirects=True, timeout=10)
+        head.raise_for_status()
+        size = int(head.headers.get('content-length', 0))
+        supports_range = head.headers.get('accept-ranges', '').lower() == 'bytes'
+        return head.url, size, supports_range
+    except (requests.RequestException, ValueError):
+        # יש שרתים שלא מקבלים HEAD - נוריד רגיל
+        return url, 0, False
+
+
+class _RangeNotSupported(IOError):
+    """
+    השרת הצהיר על Accept-Ranges ב-HEAD אבל ענה לבקשת טווח בלי 206
+    """
+
+
+def _fetch_range(url: str, fd: int, start: int, end: int, on_bytes) -> None:
+    """
+    מוריד את הבתים start-end וכותב אותם ישירות למקומם בקובץ
+    """
+    headers = {'Range': f'bytes={start}-{end}'}
+    with SESSION.get(url, headers=headers, stream=True, timeout=60) as response:
+        if response.status_code != 206:
+            response.raise_for_status()
+            raise _RangeNotSupported(f"השרת לא החזיר טווח (status {response.status_code})")
+
+        pos = start
+        for chunk in response.iter_content(chunk_size=1 << 20):
+            os.pwrite(fd, chunk, pos)
+            pos += len(chunk)
+            on_bytes(len(chunk))
+
+    if pos != end + 1:
+        raise IOError(f"הטווח {start}-{end} לא הורד במלואו")
+
+
+class _CountingReader:
+    """
+    עוטף stream ומדווח כמה בתים נקראו - כך copyfileobj יכול להעתיק
+    בבלוקים גדולים ועדיין נציג התקדמות
+    """
+
+    def __init__(self, raw, on_bytes):
+        self.raw = raw
+        self.on_bytes = on_bytes
+        self.count = 0
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        if data:
+            self.count += len(data)
+            self.on_bytes(len(data))
+        return data
+
+
 def download_mp3(url: str, output_path: Path, show_progress: bool = True) -> bool:
     """
     מוריד קובץ MP3 עם הצגת התקדמות
+
+    אם השרת תומך ב-Range, הקובץ מחולק לכמה טווחים שיורדים במקביל
     """
+    # מורידים לקובץ זמני ומשנים שם רק בסוף - קובץ MP3 קיים תמיד שלם
+    part_path = output_path.with_name(output_path.name + '.part')
     try:
-        # התחל הורדה עם streaming
-        response = requests.get(url, headers=HEADERS, stream=True, timeout=60)
-        response.raise_for_status()
-
-        # קבל גודל הקובץ
-        total_size = int(response.headers.get('content-length', 0))
+        final_url, total_size, supports_range = _probe_download(url)
         total_mb = total_size / (1024 * 1024) if total_size else 0
 
+        lock = threading.Lock()
         downloaded = 0
-        chunk_size = 8192
-
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
 
-                    if show_progress and total_size:
-                        percent = (downloaded / total_size) * 100
-                        downloaded_mb = downloaded / (1024 * 1024)
-                        print(f"\r    הורדה: {percent:.1f}% ({downloaded_mb:.1f}/{total_mb:.1f} MB)", end='', flush=True)
+        def on_bytes(n):
+            nonlocal downloaded
+            with lock:
+                downloaded += n
+                if show_progress and total_size:
+                    percent = (downloaded / total_size) * 100
+                    downloaded_mb = downloaded / (1024 * 1024)
+                    print(f"\r    הורדה: {percent:.1f}% ({downloaded_mb:.1f}/{total_mb:.1f} MB)", end='', flush=True)
+
+        use_ranges = bool(supports_range and total_size and hasattr(os, 'pwrite'))
+        if use_ranges:
+            # חלק לטווחים שווים והורד במקביל לתוך קובץ מוקצה מראש
+            part_size = -(-total_size // PARALLEL_DOWNLOAD_PARTS)
+            ranges = [(i, min(i + part_size, total_size) - 1) for i in range(0, total_size, part_size)]
+
+            fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.ftruncate(fd, total_size)
+                with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                    futures = [pool.submit(_fetch_range, final_url, fd, start, end, on_bytes)
+                               for start, end in ranges]
+                    for future in futures:
+                        future.result()
+            except _RangeNotSupported:
+                # ה-HEAD הבטיח טווחים אבל ה-GET מתעלם מהם - נוריד רגיל ב-stream אחד
+                use_ranges = False
+                downloaded = 0
+            finally:
+                os.close(fd)
+
+        if not use_ranges:
+            # התחל הורדה עם streaming
+            response = SESSION.get(final_url, stream=True, timeout=60)
+            try:
+                response.raise_for_status()
+
+                # קבל גודל הקובץ
+                total_size = int(response.headers.get('content-length', 0))
+                total_mb = total_size / (1024 * 1024) if total_size else 0
+
+                response.raw.decode_content = True
+                reader = _CountingReader(response.raw, on_bytes)
+                with open(part_path, 'wb', buffering=1 << 20) as f:
+                    if total_size and hasattr(os, 'posix_fallocate'):
+                        # הקצה את כל הקובץ מראש - פחות פרגמנטציה בדיסק
+                        try:
+                            os.posix_fallocate(f.fileno(), 0, total_size)
+                        except OSError:
+                            pass  # מערכת קבצים בלי fallocate - פשוט כותבים בלי הקצאה
+                    shutil.copyfileobj(reader, f, length=1 << 20)
+            finally:
+                response.close()
+
+            # הקובץ הוקצה מראש לגודל המלא, כך שגוף קטוע (urllib3 1.x לא זורק על זה)
+            # היה נראה כמו קובץ שלם - בודקים כמה בתים באמת הגיעו
+            if total_size and not response.headers.get('content-encoding') and reader.count != total_size:
+                raise IOError(f"ההורדה נקטעה: התקבלו {reader.count} מתוך {total_size} בתים")
+
+        os.replace(part_path, output_path)
 
         if show_progress:
             print()  # שורה חדשה אחרי ההתקדמות
@@ -371,20 +774,135 @@ def download_mp3(url: str, output_path: Path, show_progress: bool = True) -> boo
 
     except Exception as e:
         print_error(f"שגיאה בהורדה: {e}")
+        part_path.unlink(missing_ok=True)
         return False
 
 
+def find_existing_file(directory: Path, suffix: str, min_size: int = 1) -> Path:
+    """
+    מחפש קובץ מריצה קודמת (מכל תאריך) לפי סוף השם שלו
+    """
+    for path in directory.iterdir():
+        if path.name.endswith(suffix) and path.stat().st_size >= min_size:
+            return path
+    return None
+
+
 # =============================================================================
 # שלב 4: תמלול עם Gemini
 # =============================================================================
 
-def transcribe_with_gemini(audio_path: Path) -> str:
+_TRANSCRIBE_PROMPT = """תמלל את קובץ האודיו הזה בעברית.
+
+דרישות:
+1. תמלל את כל הדיבור בצורה מדויקת
+2. הוסף timestamps בפורמט [MM:SS] בתחילת כל פסקה או כל דקה-שתיים
+3. אם יש יותר מדובר אחד, סמן אותם כ: [דובר 1], [דובר 2] וכו'
+4. שמור על פיסוק נכון - נקודות, פסיקים, סימני שאלה
+5. חלק לפסקאות לקריאות
+
+התמלול:"""
+
+
+def file_state(audio_file) -> str:
     """
-    מתמלל קובץ אודיו עם Google Gemini API
+    מצב הקובץ ב-Gemini (PROCESSING / ACTIVE / FAILED), או None אם ה-SDK לא מילא אותו
     """
-    import shutil
-    import tempfile
+    state = getattr(audio_file, "state", None)
+    return getattr(state, "name", None)
 
+
+def wait_for_file(client, audio_file, max_delay: float = 15.0, max_errors: int = 6):
+    """
+    ממתין שהקובץ ב-Gemini יסיים עיבוד.
+    קודם בודקים את המצב שחזר מההעלאה - קובץ שכבר ACTIVE לא מחכה בכלל.
+    ההמתנה בין בדיקות מתחילה בחצי שנייה ומוכפלת עד max_delay (עם jitter),
+    ושגיאות רשת זמניות נבלעות עד max_errors ברצף.
+    """
+    delay = 0.5
+    errors = 0
+    polls = 0
+    while True:
+        state = file_state(audio_file)
+        # אין מצב מיד אחרי ההעלאה - בודקים פעם אחת מיד, בלי לישון
+        if state != "PROCESSING" and (state is not None or polls):
+            break
+        if state == "PROCESSING":
+            time.sleep(delay + random.uniform(0, delay * 0.5))
+            delay = min(delay * 2, max_delay)
+        polls += 1
+        try:
+            audio_file = client.files.get(name=audio_file.name)
+            errors = 0
+        except Exception:
+            errors += 1
+            if errors >= max_errors:
+                raise
+    return audio_file
+
+
+@functools.lru_cache(maxsize=4)
+def get_genai_client(api_key: str):
+    """
+    מחזיר genai.Client אחד לכל API key - כך כל הפרקים ב-REPL
+    משתמשים באותו מאגר חיבורים ל-Gemini במקום לפתוח TLS מחדש
+    """
+    from google import genai
+    return genai.Client(api_key=api_key)
+
+
+def _stream_transcript(client, audio_file):
+    """
+    מחזיר את התמלול בחלקים, כפי ש-Gemini מייצר אותם,
+    ומוחק את הקובץ מ-Gemini ברקע כשהתמלול נגמר (או נכשל)
+    """
+    try:
+        for chunk in client.models.generate_content_stream(
+            model="gemini-2.5-flash",
+            contents=[_TRANSCRIBE_PROMPT, audio_file]
+        ):
+            if chunk.text:
+                yield chunk.text
+    finally:
+        delete_uploaded_file(client, audio_file.name)
+
+
+def delete_uploaded_file(client, name: str):
+    """
+    מוחק את הקובץ מ-Gemini ב-thread ברקע - אין סיבה לחכות לאישור,
+    ואם התוכנית נסגרת קודם Gemini מוחק קבצים שהועלו בעצמו אחרי 48 שעות
+    """
+    def _delete():
+        try:
+            client.files.delete(name=name)
+        except Exception:
+            pass
+
+    threading.Thread(target=_delete, daemon=True).start()
+
+
+def print_gemini_error(e: Exception):
+    """
+    מדפיס הסבר מתאים לשגיאה מ-Gemini
+    """
+    error_msg = str(e)
+    if "API_KEY_INVALID" in error_msg or "invalid" in error_msg.lower():
+        print_error("ה-API Key לא תקין!")
+        print("אנא בדוק את ה-GEMINI_API_KEY בקובץ .env")
+    elif "RESOURCE_EXHAUSTED" in error_msg or "quota" in error_msg.lower():
+        print_error("חרגת ממכסת השימוש החינמית של Gemini")
+        print("נסה שוב מחר או המתן כמה דקות")
+    else:
+        print_error(f"שגיאה בתמלול: {e}")
+
+
+def transcribe_with_gemini(audio_path: Path):
+    """
+    מתמלל קובץ אודיו עם Google Gemini API
+
+    Returns:
+        iterator של חלקי טקסט (התמלול נכתב לקובץ תוך כדי יצירה), או None בכישלון
+    """
     api_key = os.getenv("GEMINI_API_KEY")
 
     if not api_key:
@@ -399,65 +917,29 @@ def transcribe_with_gemini(audio_path: Path) -> str:
         return None
 
     try:
-        from google import genai
-
-        # צור client
-        client = genai.Client(api_key=api_key)
+        # client משותף - חיבורי ה-HTTP ל-Gemini נשמרים בין פרקים
+        client = get_genai_client(api_key)
 
         # בדוק גודל הקובץ
         file_size_mb = audio_path.stat().st_size / (1024 * 1024)
         print(f"    גודל הקובץ: {file_size_mb:.1f} MB")
 
-        # העתק לקובץ זמני עם שם ASCII (בגלל באג בספריית httpx)
-        temp_dir = tempfile.mkdtemp()
-        temp_path = Path(temp_dir) / "podcast_audio.mp3"
-        shutil.copy2(audio_path, temp_path)
-
-        # העלה את הקובץ
+        # העלה את הקובץ ישירות - שם הקובץ כבר ASCII (ראה process_podcast)
         print("    מעלה קובץ ל-Gemini...")
-        audio_file = client.files.upload(file=str(temp_path))
+        audio_file = client.files.upload(file=str(audio_path))
 
         # המתן שהקובץ יהיה מוכן
         print("    ממתין לעיבוד הקובץ...")
-        while audio_file.state.name == "PROCESSING":
-            time.sleep(2)
-            audio_file = client.files.get(name=audio_file.name)
+        audio_file = wait_for_file(client, audio_file)
 
-        if audio_file.state.name == "FAILED":
+        if file_state(audio_file) == "FAILED":
             print_error("העלאת הקובץ נכשלה")
             return None
 
         # בקש תמלול
         print("    מתמלל... (זה יכול לקחת כמה דקות)")
 
-        prompt = """תמלל את קובץ האודיו הזה בעברית.
-
-דרישות:
-1. תמלל את כל הדיבור בצורה מדויקת
-2. הוסף timestamps בפורמט [MM:SS] בתחילת כל פסקה או כל דקה-שתיים
-3. אם יש יותר מדובר אחד, סמן אותם כ: [דובר 1], [דובר 2] וכו'
-4. שמור על פיסוק נכון - נקודות, פסיקים, סימני שאלה
-5. חלק לפסקאות לקריאות
-
-התמלול:"""
-
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=[prompt, audio_file]
-        )
-
-        # מחק את הקובץ מ-Gemini ואת הקובץ הזמני
-        try:
-            client.files.delete(name=audio_file.name)
-        except:
-            pass
-
-        try:
-            shutil.rmtree(temp_dir)
-        except:
-            pass
-
-        return response.text
+        return _stream_transcript(client, audio_file)
 
     except ImportError:
         print_error("ספריית google-genai לא מותקנת!")
@@ -465,15 +947,7 @@ def transcribe_with_gemini(audio_path: Path) -> str:
         return None
 
     except Exception as e:
-        error_msg = str(e)
-        if "API_KEY_INVALID" in error_msg or "invalid" in error_msg.lower():
-            print_error("ה-API Key לא תקין!")
-            print("אנא בדוק את ה-GEMINI_API_KEY בקובץ .env")
-        elif "RESOURCE_EXHAUSTED" in error_msg or "quota" in error_msg.lower():
-            print_error("חרגת ממכסת השימוש החינמית של Gemini")
-            print("נסה שוב מחר או המתן כמה דקות")
-        else:
-            print_error(f"שגיאה בתמלול: {e}")
+        print_gemini_error(e)
         return None
 
 
@@ -481,12 +955,13 @@ def transcribe_with_gemini(audio_path: Path) -> str:
 # פונקציה ראשית
 # =============================================================================
 
-def process_podcast(spotify_url: str) -> tuple:
+def process_podcast(spotify_url: str, show_progress: bool = True) -> tuple:
     """
     מעבד פודקאסט מלינק ספוטיפיי
 
     Returns:
-        tuple: (mp3_path, transcript_path) או (None, None) בכישלון
+        tuple: (mp3_path, transcript_path) או (None, None) בכישלון.
+               אם יש כבר תמלול מריצה קודמת, mp3_path יכול להיות None (הקובץ לא מורד שוב)
     """
     print("\n" + "=" * 60)
     print_step("🎙️", "מתחיל עיבוד פודקאסט")
@@ -506,9 +981,9 @@ def process_podcast(spotify_url: str) -> tuple:
     # שלב 2: מצא Show ID
     print_step("🔍", "מחפש את הפודקאסט...")
 
-    show_id = ids.get("show_id")
-    if not show_id:
-        show_id = get_show_id_from_episode(ids["episode_id"])
+    # בקשה אחת לדף ה-embed נותנת גם את ה-Show ID וגם את שמות הפרק והפודקאסט
+    podcast_info = get_podcast_info_from_spotify(ids["episode_id"])
+    show_id = ids.get("show_id") or podcast_info["show_id"]
 
     if not show_id:
         print_error("לא הצלחתי למצוא את הפודקאסט")
@@ -517,8 +992,6 @@ def process_podcast(spotify_url: str) -> tuple:
 
     print(f"    Show ID: {show_id}")
 
-    # קבל מידע נוסף על הפרק
-    podcast_info = get_podcast_info_from_spotify(ids["episode_id"])
     if podcast_info["episode_title"]:
         print(f"    פרק: {podcast_info['episode_title']}")
     if podcast_info["show_title"]:
@@ -527,11 +1000,42 @@ def process_podcast(spotify_url: str) -> tuple:
     # שלב 3: מצא RSS feed אמיתי (עם קבצי MP3)
     print_step("📡", "מחפש RSS feed...")
 
-    # נסה קודם למצוא RSS אמיתי דרך iTunes (יש שם MP3)
     rss_url = None
+    feed = None
+    feed_is_cached = False
     show_title = podcast_info.get("show_title") or "podcast"
 
-    if show_title and show_title != "podcast":
+    # feed שעובד לאחרונה - חוסך את iTunes ואת הורדת ה-RSS
+    cached, cache_age = load_rss_cache(show_id)
+    has_feed = bool(cached and cached.get("entries"))
+    if has_feed and cache_age < RSS_CACHE_TTL:
+        print(f"    משתמש ב-RSS מהמטמון ({int(cache_age / 60)} דקות)")
+        rss_url = cached["rss_url"]
+        feed = feed_from_cache(cached)
+        feed_is_cached = True
+    elif has_feed and not cached.get("complete", True):
+        # מטמון חלקי וישן - 304 לא יחזיר את שאר הפרקים, אז קוראים שוב כ-stream מאותו URL
+        rss_url = cached["rss_url"]
+    elif has_feed:
+        # מטמון ישן - בקשה מותנית; אם ה-feed לא השתנה השרת עונה 304 בלי גוף
+        rss_url = cached["rss_url"]
+        feed = fetch_rss_feed(rss_url, cached)
+        if feed and feed.entries:
+            save_rss_cache(show_id, rss_url, feed)
+        else:
+            rss_url = None
+            feed = None
+
+    # RSS שכבר נתן MP3 תקין לאחרונה - מדלגים על iTunes ו-Spotifeed
+    # (אלא אם זה בדיוק ה-feed שהבקשה המותנית אליו נכשלה למעלה)
+    last_good = cached.get("last_good_rss_url") if cached else None
+    if (not feed and not rss_url and last_good and last_good != cached.get("rss_url")
+            and time.time() - cached.get("last_good_at", 0) < LAST_GOOD_RSS_TTL):
+        rss_url = last_good
+        print(f"    משתמש ב-RSS שעבד לאחרונה: {rss_url[:60]}...")
+
+    # נסה קודם למצוא RSS אמיתי דרך iTunes (יש שם MP3)
+    if not feed and not rss_url and show_title and show_title != "podcast":
         print(f"    מחפש ב-iTunes: {show_title}")
         rss_url = get_rss_from_itunes(show_title)
         if rss_url:
@@ -543,27 +1047,53 @@ def process_podcast(spotify_url: str) -> tuple:
         rss_url = get_rss_from_spotifeed(show_id)
         print(f"    RSS: {rss_url}")
 
-    feed = fetch_rss_feed(rss_url)
-    if not feed or not feed.entries:
-        print_error("לא הצלחתי לקבל RSS feed")
-        print("ייתכן שהפודקאסט לא זמין דרך RSS או שהוא בלעדי לספוטיפיי")
-        return None, None
-
-    print(f"    נמצאו {len(feed.entries)} פרקים ב-feed")
-
-    # שם הפודקאסט מה-feed (עדכון אם יש שם טוב יותר)
-    show_title = feed.feed.get('title', show_title)
-
-    # שלב 4: מצא את הפרק הספציפי
-    print_step("🎯", "מחפש את הפרק ב-RSS...")
-    episode = find_episode_in_rss(feed, ids["episode_id"], podcast_info.get("episode_title"))
+    # בלי מטמון: קוראים את ה-RSS רק עד הפרק המבוקש
+    episode = None
+    if not feed:
+        entry, feed = stream_episode_from_rss(rss_url, ids["episode_id"], podcast_info.get("episode_title"))
+        if entry is not None:
+            print("    הפרק נמצא בלי להוריד את כל ה-feed")
+            episode = extract_episode_data(entry)
+            # שומרים גם את החלק שנקרא - פרקים חדשים נמצאים בדרך כלל בראש ה-feed
+            save_rss_cache(show_id, rss_url, feed, complete=False)
+        else:
+            if not feed:
+                feed = fetch_rss_feed(rss_url)
+            if feed and feed.entries:
+                save_rss_cache(show_id, rss_url, feed)
+
+    if not episode:
+        if not feed or not feed.entries:
+            print_error("לא הצלחתי לקבל RSS feed")
+            print("ייתכן שהפודקאסט לא זמין דרך RSS או שהוא בלעדי לספוטיפיי")
+            return None, None
+
+        print(f"    נמצאו {len(feed.entries)} פרקים ב-feed")
+
+        # שם הפודקאסט מה-feed (עדכון אם יש שם טוב יותר)
+        show_title = feed.feed.get('title', show_title)
+
+        # שלב 4: מצא את הפרק הספציפי
+        print_step("🎯", "מחפש את הפרק ב-RSS...")
+        episode = find_episode_in_rss(feed, ids["episode_id"], podcast_info.get("episode_title"))
+
+        # פרק שפורסם אחרי שהמטמון נשמר - בודקים מול השרת (בקשה מותנית) לפני שמוותרים
+        if not episode and feed_is_cached:
+            print("    הפרק לא במטמון, בודק אם ה-feed התעדכן...")
+            # על מטמון חלקי 304 רק יחזיר אותו שוב - מורידים את כל ה-feed
+            fresh_feed = fetch_rss_feed(rss_url, cached if cached.get("complete", True) else None)
+            if fresh_feed and fresh_feed.entries:
+                save_rss_cache(show_id, rss_url, fresh_feed)
+                feed = fresh_feed
+                episode = find_episode_in_rss(feed, ids["episode_id"], podcast_info.get("episode_title"))
 
     if not episode or not episode.get("mp3_url"):
         print_error("לא הצלחתי למצוא את הפרק או את קובץ ה-MP3")
 
         # הצע פרקים אחרונים
-        print("\nפרקים אחרונים שנמצאו:")
-        for i, entry in enumerate(feed.entries[:5]):
+        if feed:
+            print("\nפרקים אחרונים שנמצאו:")
+        for i, entry in enumerate(feed.entries[:5] if feed else []):
             print(f"  {i+1}. {entry.get('title', 'ללא שם')}")
 
         return None, None
@@ -575,29 +1105,38 @@ def process_podcast(spotify_url: str) -> tuple:
     print_step("⬇️", "מוריד את הפודקאסט...")
 
     # צור שם קובץ
-    date_str = datetime.now().strftime("%Y%m%d")
+    processed_at = datetime.now()
+    date_str = processed_at.strftime("%Y%m%d")
     safe_show = sanitize_filename(show_title)[:30]
     safe_episode = episode["safe_title"][:50]
-    mp3_filename = f"{date_str}_{safe_show}_{safe_episode}.mp3"
+    # שם ה-MP3 ב-ASCII בלבד (הוא מועלה ל-Gemini ישירות - באג ב-httpx עם שמות לא-ASCII)
+    ascii_parts = [date_str, ascii_filename(show_title)[:30], ascii_filename(episode["title"])[:50], ids["episode_id"]]
+    mp3_filename = "_".join(part for part in ascii_parts if part) + ".mp3"
     mp3_path = DOWNLOADS_DIR / mp3_filename
 
-    if not download_mp3(episode["mp3_url"], mp3_path):
-        return None, None
+    existing_mp3 = find_existing_file(DOWNLOADS_DIR, f"_{ids['episode_id']}.mp3")
 
-    print(f"    נשמר: {mp3_path}")
+    # תמלול מריצה קודמת (ה-Episode ID בסוף השם) - לא מורידים, לא מעלים ולא משלמים ל-Gemini שוב
+    existing_transcript = find_existing_file(
+        TRANSCRIPTS_DIR, f"_{ids['episode_id']}_transcript.txt", min_size=1024
+    )
+    if existing_transcript:
+        print(f"    תמלול כבר קיים, מדלג על ההורדה והתמלול: {existing_transcript}")
+        return existing_mp3, existing_transcript
 
-    # שלב 6: תמלל
-    print_step("📝", "מתמלל עם Gemini...")
-    transcript = transcribe_with_gemini(mp3_path)
+    # הפרק כבר הורד בריצה קודמת - בודקים שהגודל תואם לשרת
+    if existing_mp3 and _probe_download(episode["mp3_url"])[1] in (0, existing_mp3.stat().st_size):
+        mp3_path = existing_mp3
+        print(f"    הקובץ כבר קיים, מדלג על ההורדה: {mp3_path}")
+    else:
+        if not download_mp3(episode["mp3_url"], mp3_path, show_progress=show_progress):
+            return None, None
 
-    if not transcript:
-        print("    התמלול נכשל, אבל הקובץ MP3 נשמר")
-        return mp3_path, None
+        mark_rss_url_good(show_id, rss_url)
 
-    # שלב 7: שמור תמלול
-    print_step("💾", "שומר תמלול...")
+        print(f"    נשמר: {mp3_path}")
 
-    transcript_filename = f"{date_str}_{safe_show}_{safe_episode}_transcript.txt"
+    transcript_filename = f"{date_str}_{safe_show}_{safe_episode}_{ids['episode_id']}_transcript.txt"
     transcript_path = TRANSCRIPTS_DIR / transcript_filename
 
     # הוסף header לתמלול
@@ -606,20 +1145,79 @@ def process_podcast(spotify_url: str) -> tuple:
 ═══════════════════════════════════════════════════════════
 פודקאסט: {show_title}
 פרק: {episode['title']}
-תאריך עיבוד: {datetime.now().strftime('%Y-%m-%d %H:%M')}
+תאריך עיבוד: {processed_at.strftime('%Y-%m-%d %H:%M')}
 לינק מקורי: {spotify_url}
 ═══════════════════════════════════════════════════════════
 
 """
 
-    with open(transcript_path, 'w', encoding='utf-8') as f:
-        f.write(header + transcript)
+    # שלב 6: תמלל
+    print_step("📝", "מתמלל עם Gemini...")
+    transcript = transcribe_with_gemini(mp3_path)
+
+    if not transcript:
+        print("    התמלול נכשל, אבל הקובץ MP3 נשמר")
+        return mp3_path, None
+
+    # שלב 7: שמור תמלול - כל חלק נכתב לקובץ ברגע שהוא מגיע מ-Gemini
+    print_step("💾", "שומר תמלול...")
+
+    got_text = False
+    try:
+        with open(transcript_path, 'wb', buffering=1 << 20) as f:
+            f.write(header.encode('utf-8'))
+            for text in transcript:
+                f.write(text.encode('utf-8'))
+                got_text = True
+    except Exception as e:
+        print_gemini_error(e)
+        got_text = False
+
+    if not got_text:
+        # לא משאירים תמלול ריק/חלקי - בריצה הבאה הוא ייראה כמו תמלול קיים
+        transcript_path.unlink(missing_ok=True)
+        print("    התמלול נכשל, אבל הקובץ MP3 נשמר")
+        return mp3_path, None
 
     print(f"    נשמר: {transcript_path}")
 
     return mp3_path, transcript_path
 
 
+def is_episode_url(url: str) -> bool:
+    """
+    ולידציה בסיסית ללינק של פרק ספוטיפיי (מדפיס הסבר אם לא תקין)
+    """
+    if "spotify.com" not in url and not url.startswith("spotify:"):
+        print_error(f"זה לא נראה כמו לינק ספוטיפיי: {url}")
+        print("דוגמה: https://open.spotify.com/episode/XXXXXXXX")
+        return False
+
+    if "/episode/" not in url and ":episode:" not in url:
+        print_error(f"זה נראה כמו לינק של פודקאסט שלם, לא של פרק: {url}")
+        print("אני צריך לינק של פרק ספציפי (episode)")
+        print("דוגמה: https://open.spotify.com/episode/XXXXXXXX")
+        return False
+
+    return True
+
+
+def report_result(spotify_url: str, mp3_path, transcript_path):
+    """
+    מדפיס את תוצאת העיבוד של פרק אחד
+    """
+    if mp3_path or transcript_path:
+        print_success("הפעולה הושלמה!")
+        print(f"\n📁 קבצים שנוצרו:")
+        if mp3_path:
+            print(f"   MP3: {mp3_path}")
+        if transcript_path:
+            print(f"   תמלול: {transcript_path}")
+    else:
+        print(f"\n😔 לא הצלחתי לעבד את הפודקאסט הזה: {spotify_url}")
+        print("נסה פודקאסט אחר.")
+
+
 def main():
     """
     הפונקציה הראשית
@@ -659,30 +1257,25 @@ def main():
         if not spotify_url:
             continue
 
-        # ולידציה בסיסית
-        if "spotify.com" not in spotify_url and not spotify_url.startswith("spotify:"):
-            print_error("זה לא נראה כמו לינק ספוטיפיי")
-            print("דוגמה: https://open.spotify.com/episode/XXXXXXXX")
+        # אפשר להדביק כמה לינקים בשורה אחת (מופרדים ברווחים)
+        urls = [url for url in spotify_url.split() if is_episode_url(url)]
+        if not urls:
             continue
 
-        if "/episode/" not in spotify_url and ":episode:" not in spotify_url:
-            print_error("זה נראה כמו לינק של פודקאסט שלם, לא של פרק")
-            print("אני צריך לינק של פרק ספציפי (episode)")
-            print("דוגמה: https://open.spotify.com/episode/XXXXXXXX")
+        if len(urls) == 1:
+            report_result(urls[0], *process_podcast(urls[0]))
             continue
 
-        # עבד את הפודקאסט
-        mp3_path, transcript_path = process_podcast(spotify_url)
-
-        if mp3_path:
-            print_success("הפעולה הושלמה!")
-            print(f"\n📁 קבצים שנוצרו:")
-            print(f"   MP3: {mp3_path}")
-            if transcript_path:
-                print(f"   תמלול: {transcript_path}")
-        else:
-            print("\n😔 לא הצלחתי לעבד את הפודקאסט הזה.")
-            print("נסה פודקאסט אחר.")
+        # כמה פרקים - הורדה ותמלול במקביל (רשת ו-Gemini, לא CPU)
+        print(f"\nמעבד {len(urls)} פרקים במקביל (עד {PODCAST_CONCURRENCY} בו-זמנית)...")
+        with ThreadPoolExecutor(max_workers=max(1, PODCAST_CONCURRENCY)) as pool:
+            futures = {pool.submit(process_podcast, url, False): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    report_result(url, *future.result())
+                except Exception as e:
+                    print_error(f"{url}: {e}")
 
 
 if __name__ == "__main__":